@@ -8,6 +8,7 @@
 """Define base classes for application definitions"""
 
 import os
+import sys
 import stat
 import re
 import six
@@ -54,12 +55,27 @@ class ApplicationBase(object, metaclass=ApplicationMeta):
     _builtin_required_key = 'required'
     _workload_exec_key = 'executables'
     _inventory_file_name = 'ramble_inventory.json'
+    _chain_orders = frozenset(['after_chain', 'after_root', 'before_chain', 'before_root'])
 
     #: Lists of strings which contains GitHub usernames of attributes.
     #: Do not include @ here in order not to unnecessarily ping the users.
     maintainers: List[str] = []
     tags: List[str] = []
 
+    # An application instance is created for every experiment (and every
+    # chained copy). These slots only keep the common attributes out of the
+    # instance __dict__ when every subclass also declares __slots__; the
+    # application definitions in the builtin repo do not, so their instances
+    # still get a __dict__.
+    __slots__ = ('_setup_phases', '_analyze_phases', '_archive_phases',
+                 '_mirror_phases', '_vars_are_expanded', 'expander', 'variables',
+                 'experiment_set', 'internals', 'is_template',
+                 'chained_experiments', 'chain_order', 'chain_prepend',
+                 'chain_append', 'chain_commands', '_env_variable_sets',
+                 'modifiers', '_modifier_instances', '_modifier_builtins',
+                 '_input_fetchers', 'hash_inventory', 'experiment_hash',
+                 '_file_path', 'application_class', '_verbosity')
+
     def __init__(self, file_path):
         super().__init__()
 
@@ -104,7 +120,8 @@ class ApplicationBase(object, metaclass=ApplicationMeta):
         """Deep copy an application instance"""
         new_copy = type(self)(self._file_path)
 
-        new_copy.set_env_variable_sets(self._env_variable_sets.copy())
+        # set_env_variable_sets copies the list itself
+        new_copy.set_env_variable_sets(self._env_variable_sets)
         new_copy.set_variables(self.variables.copy(), self.experiment_set)
         new_copy.set_internals(self.internals.copy())
         new_copy.set_template(False)
@@ -422,6 +439,44 @@ class ApplicationBase(object, metaclass=ApplicationMeta):
 
         return (env_cmds_arr.split('\n'), var_set_orig)
 
+    def _validate_chain_definition(self, parent_namespace, chain_def):
+        """Perform basic validation on a chained experiment definition
+
+        Args:
+            parent_namespace: Namespace of the experiment defining the chain
+            chain_def: Definition of the chained experiment
+
+        Raises:
+            InvalidChainError: If the definition is invalid
+        """
+        if 'name' not in chain_def:
+            raise InvalidChainError('Invalid experiment chain defined:\n' +
+                                    f'    Primary experiment {parent_namespace}\n' +
+                                    f'    Chain definition: {str(chain_def)}\n' +
+                                    '    "name" keyword must be defined')
+
+        if 'order' in chain_def:
+            if chain_def['order'] not in self._chain_orders:
+                raise InvalidChainError('Invalid experiment chain defined:\n' +
+                                        f'    Primary experiment {parent_namespace}\n' +
+                                        f'    Chain definition: {str(chain_def)}\n' +
+                                        '    Optional keyword "order" must ' +
+                                        f'be one of {str(sorted(self._chain_orders))}\n')
+
+        if 'command' not in chain_def:
+            raise InvalidChainError('Invalid experiment chain defined:\n' +
+                                    f'    Primary experiment {parent_namespace}\n' +
+                                    f'    Chain definition: {str(chain_def)}\n' +
+                                    '    "command" keyword must be defined')
+
+        if 'variables' in chain_def:
+            if not isinstance(chain_def['variables'], dict):
+                raise InvalidChainError('Invalid experiment chain defined:\n' +
+                                        f'    Primary experiment {parent_namespace}\n' +
+                                        f'    Chain definition: {str(chain_def)}\n' +
+                                        '    Optional keyword "variables" ' +
+                                        'must be a dictionary')
+
     def create_experiment_chain(self, workspace):
         """Create the necessary chained experiments for this instance
 
@@ -434,73 +489,57 @@ class ApplicationBase(object, metaclass=ApplicationMeta):
         if not self.chained_experiments or self.is_template:
             return
 
-        # Build initial stack. Uses a reversal of the current instance's
-        # chained experiments
         parent_namespace = self.expander.experiment_namespace
-        classes_in_stack = set([self])
+        # The chain is walked depth first, and may fan out to several
+        # experiments at each level, so cycles are detected by tracking the
+        # instances on the current path rather than following a single link.
+        classes_in_stack = {self}
+        # Names of the experiments on the current path, to report cycles
+        chain_path = [parent_namespace]
         chain_idx = 0
         chain_stack = []
-        for exp in reversed(self.chained_experiments):
-            for exp_name in self.experiment_set.search_primary_experiments(exp['name']):
-                child_inst = self.experiment_set.get_experiment(exp_name)
 
-                if child_inst in classes_in_stack:
-                    raise ChainCycleDetectedError('Cycle detected in experiment chain:\n' +
-                                                  f'    Primary experiment {parent_namespace}\n' +
-                                                  f'    Chained expeirment name: {exp_name}\n' +
-                                                  f'    Chain definition: {str(exp)}')
-                chain_stack.append((exp_name, exp))
+        def push_chained_experiments(inst):
+            """Push the chained experiments of inst onto the stack
+
+            They are pushed in reverse, so they are visited in definition
+            order. A chained experiment already on the current path is a back
+            edge, and is reported as a cycle as soon as it is seen.
+            """
+            for exp in reversed(inst.chained_experiments):
+                for exp_name in self.experiment_set.search_primary_experiments(exp['name']):
+                    child_inst = self.experiment_set.get_experiment(exp_name)
+
+                    if child_inst in classes_in_stack:
+                        raise ChainCycleDetectedError('Cycle detected in experiment chain:\n' +
+                                                      '    Primary experiment ' +
+                                                      f'{parent_namespace}\n' +
+                                                      '    Chained expeirment name: ' +
+                                                      f'{exp_name}\n' +
+                                                      f'    Chain definition: {str(exp)}\n' +
+                                                      '    Cycle: ' +
+                                                      ' -> '.join(chain_path + [exp_name]))
+                    chain_stack.append((exp_name, exp))
 
-        parent_run_dir = self.expander.expand_var(
-            self.expander.expansion_str(keywords.experiment_run_dir)
-        )
+        push_chained_experiments(self)
+
+        parent_run_dir = self.expander.experiment_run_dir
 
         # Continue until the stack is empty
         while len(chain_stack) > 0:
             cur_exp_name = chain_stack[-1][0]
             cur_exp_def = chain_stack[-1][1]
 
-            # Perform basic validation on the chained experiment definition
-            if 'name' not in cur_exp_def:
-                raise InvalidChainError('Invalid experiment chain defined:\n' +
-                                        f'    Primary experiment {parent_namespace}\n' +
-                                        f'    Chain definition: {str(exp)}\n' +
-                                        '    "name" keyword must be defined')
-
-            if 'order' in cur_exp_def:
-                possible_orders = ['after_chain', 'after_root', 'before_chain', 'before_root']
-                if cur_exp_def['order'] not in possible_orders:
-                    raise InvalidChainError('Invalid experiment chain defined:\n' +
-                                            f'    Primary experiment {parent_namespace}\n' +
-                                            f'    Chain definition: {str(exp)}\n' +
-                                            '    Optional keyword "order" must ' +
-                                            f'be one of {str(possible_orders)}\n')
-
-            if 'command' not in cur_exp_def.keys():
-                raise InvalidChainError('Invalid experiment chain defined:\n' +
-                                        f'    Primary experiment {parent_namespace}\n' +
-                                        f'    Chain definition: {str(exp)}\n' +
-                                        '    "command" keyword must be defined')
-
-            if 'variables' in cur_exp_def:
-                if not isinstance(cur_exp_def['variables'], dict):
-                    raise InvalidChainError('Invalid experiment chain defined:\n' +
-                                            f'    Primary experiment {parent_namespace}\n' +
-                                            f'    Chain definition: {str(exp)}\n' +
-                                            '    Optional keyword "variables" ' +
-                                            'must be a dictionary')
-
             base_inst = self.experiment_set.get_experiment(cur_exp_name)
             if base_inst in classes_in_stack:
                 chain_stack.pop()
                 classes_in_stack.remove(base_inst)
+                chain_path.pop()
 
-                order = 'after_root'
-                if 'order' in cur_exp_def:
-                    order = cur_exp_def['order']
+                order = cur_exp_def.get('order', 'after_root')
 
                 chained_name = f'{chain_idx}.{cur_exp_name}'
-                new_name = f'{parent_namespace}.chain.{chained_name}'
+                new_name = sys.intern(f'{parent_namespace}.chain.{chained_name}')
 
                 new_run_dir = os.path.join(parent_run_dir,
                                            namespace.chained_experiments, chained_name)
@@ -524,13 +563,17 @@ class ApplicationBase(object, metaclass=ApplicationMeta):
                     new_inst = base_inst.copy()
 
                     if namespace.variables in cur_exp_def:
-                        for var, val in cur_exp_def[namespace.variables].items():
-                            new_inst.variables[var] = val
+                        new_inst.variables.update(cur_exp_def[namespace.variables])
 
-                    new_inst.expander._experiment_namespace = new_name
                     new_inst.variables[keywords.experiment_run_dir] = new_run_dir
                     new_inst.variables[keywords.experiment_name] = new_name
 
+                    # These are already fully expanded, so seed the expander
+                    # rather than having it expand them again on first use
+                    new_inst.expander._experiment_namespace = new_name
+                    new_inst.expander._experiment_name = new_name
+                    new_inst.expander._experiment_run_dir = new_run_dir
+
                     # Expand the chained experiment vars, so we can build the execution command
                     new_inst.add_expand_vars(workspace)
                     chain_cmd = new_inst.expander.expand_var(cur_exp_def[keywords.command])
@@ -540,27 +583,16 @@ class ApplicationBase(object, metaclass=ApplicationMeta):
 
                 chain_idx += 1
             else:
-                # Avoid cycles, from children
-                if base_inst in classes_in_stack:
-                    chain_stack.pop()
-                else:
-                    if base_inst.chained_experiments:
-                        for exp in reversed(base_inst.chained_experiments):
-                            for exp_name in \
-                                    self.experiment_set.search_primary_experiments(exp['name']):
-                                child_inst = self.experiment_set.get_experiment(exp_name)
-                                if child_inst in classes_in_stack:
-                                    raise ChainCycleDetectedError('Cycle detected in ' +
-                                                                  'experiment chain:\n' +
-                                                                  '    Primary experiment ' +
-                                                                  f'{parent_namespace}\n' +
-                                                                  '    Chained expeirment name: ' +
-                                                                  f'{cur_exp_name}\n' +
-                                                                  '    Chain definition: ' +
-                                                                  f'{str(cur_exp_def)}')
-
-                                chain_stack.append((exp_name, exp))
-                    classes_in_stack.add(base_inst)
+                # Each definition is visited twice, so only validate it the
+                # first time, before its chained experiments are visited
+                self._validate_chain_definition(parent_namespace, cur_exp_def)
+
+                # Mark the experiment as on the path before visiting its
+                # children, so a chain back to it is caught as a cycle
+                classes_in_stack.add(base_inst)
+                chain_path.append(cur_exp_name)
+                if base_inst.chained_experiments:
+                    push_chained_experiments(base_inst)
 
         # Create the final chain order
         for exp in self.chain_prepend:
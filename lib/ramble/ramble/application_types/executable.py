@@ -19,6 +19,8 @@ class ExecutableApplication(ApplicationBase):
     It currently only utilizes phases defined in the base class.
     """
 
+    __slots__ = ()
+
     def __init__(self, file_path):
         super().__init__(file_path)
         self._setup_phases = [
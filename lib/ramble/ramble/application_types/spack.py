@@ -44,6 +44,8 @@ class SpackApplication(ApplicationBase):
                     ('software_specs', 'Software Specs')]
     _spec_keys = ['spack_spec', 'compiler_spec', 'compiler']
 
+    __slots__ = ('spack_runner',)
+
     def __init__(self, file_path):
         super().__init__(file_path)
         self._setup_phases = [
@@ -8,10 +8,12 @@
 
 import string
 import ast
-import six
+import functools
+import re
 import operator
 
 import llnl.util.tty as tty
+from llnl.util.lang import memoized
 
 import ramble.error
 import ramble.keywords
@@ -27,12 +29,173 @@ supported_math_operators = {
 
 formatter = string.Formatter()
 
+# Empty positional fields (`{}`, `{!r}`, `{:>3}`) which are not already escaped
+empty_field_regex = re.compile(r'(?<!\{)\{(?:![rsa])?(?::[^{}]*)?\}(?!\})')
+
+# Field names referring to a numbered positional argument (e.g. `0`, `1.attr`)
+numbered_field_regex = re.compile(r'\d+(?:[.\[]|$)')
+
 
 class ExpansionDict(dict):
     def __missing__(self, key):
         return '{' + key + '}'
 
 
+@memoized
+def _parse_template(in_str):
+    """Parse a template string, and cache the result
+
+    Parsing is performed with string.Formatter.parse. If the template is
+    malformed, the pieces parsed before the error are kept, along with the
+    error message, so iteration behaves the same as the uncached parser.
+
+    Args:
+        in_str (str): Input template string to parse
+
+    Returns:
+        (tuple): Tuple of parsed pieces, and an error message (or None)
+    """
+    pieces = []
+    try:
+        for piece in formatter.parse(in_str):
+            pieces.append(piece)
+    except ValueError as e:
+        return tuple(pieces), str(e)
+    return tuple(pieces), None
+
+
+def _iter_template(in_str):
+    """Iterate over the (cached) parsed pieces of a template string
+
+    Yields:
+        (literal_text, field_name, format_spec, conversion) for each piece of
+        in_str, as string.Formatter.parse would
+    """
+    pieces, error = _parse_template(in_str)
+    yield from pieces
+    if error is not None:
+        raise ValueError(error)
+
+
+@memoized
+def _compile_template(in_str):
+    """Compile a template string into a sequence of literal / keyword pieces
+
+    The keyword slots of a template are fixed, so the template only needs to
+    be parsed once. Templates using format features which require full
+    str.format_map handling (format specs, conversions, attribute or index
+    lookups, numbered positional fields) are not compiled.
+
+    Args:
+        in_str (str): Input template string to compile
+
+    Returns:
+        (tuple): Tuple of (literal_text, keyword) pairs, or None if the template
+                 cannot be compiled
+    """
+    parsed, error = _parse_template(in_str)
+    if error is not None:
+        return None
+
+    pieces = []
+    for literal, kw, spec, conversion in parsed:
+        if spec or conversion:
+            return None
+        if kw and (kw.isdigit() or '.' in kw or '[' in kw):
+            return None
+        pieces.append((literal, kw))
+    return tuple(pieces)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_math(in_str):
+    """Parse a math expression, and cache the result
+
+    The same expressions are evaluated for many experiments, so each one
+    only needs to be parsed once. Syntax errors are cached as well.
+
+    Inputs are fully expanded strings, which include per-experiment paths
+    and commands, so the cache is bounded to keep its memory use constant.
+
+    Args:
+        in_str (str): Input expression to parse
+
+    Returns:
+        (tuple): Body of the parsed expression (or None), and an error message
+                 (or None)
+    """
+    try:
+        return ast.parse(in_str, mode='eval').body, None
+    except SyntaxError as e:
+        return None, str(e)
+
+
+def _math_ast(in_str):
+    """Return the (cached) parsed body of a math expression
+
+    Raises:
+        SyntaxError: If in_str is not a valid expression
+    """
+    body, error = _parse_math(in_str)
+    if error is not None:
+        raise SyntaxError(error)
+    return body
+
+
+def _missing_positional_args(in_str):
+    """Test if a template refers to positional arguments which do not exist
+
+    Expansion never has positional arguments. str.format_map rejects
+    numbered positional fields with a ValueError, while formatting with an
+    empty argument list raises an IndexError for them. Templates mixing
+    numbered and empty fields are rejected by both, with a ValueError.
+
+    Args:
+        in_str (str): Input template string
+
+    Returns:
+        (bool): True if in_str has numbered positional fields, and no empty
+                fields
+    """
+    pieces, error = _parse_template(in_str)
+    if error is not None:
+        return False
+
+    fields = [piece[1] for piece in pieces if piece[1] is not None]
+    return '' not in fields and \
+        any(numbered_field_regex.match(field) for field in fields)
+
+
+def _escape_empty_field(match):
+    """Pass an empty positional field through, as an escaped literal
+
+    The field is rendered as `{}` using its own conversion and format spec,
+    so `{:>3}` passes through as ` {}`.
+    """
+    passthrough = match.group(0).format('{}')
+    return passthrough.replace('{', '{{').replace('}', '}}')
+
+
+def _render_template(pieces, exp_dict):
+    """Render a compiled template using the values in exp_dict
+
+    Empty keywords (i.e. `{}`) are passed through unmodified.
+
+    Args:
+        pieces (tuple): Compiled template, from _compile_template
+        exp_dict (ExpansionDict): Values to substitute for each keyword
+
+    Returns:
+        (str): Rendered template
+    """
+    out = []
+    for literal, kw in pieces:
+        out.append(literal)
+        if kw is not None:
+            out.append(str(exp_dict[kw]) if kw else '{}')
+    return ''.join(out)
+
+
 class Expander(object):
     """A class that will track and expand keyword arguments
 
@@ -47,6 +210,16 @@ class Expander(object):
 
     _keywords = ramble.keywords.keywords
 
+    # Many expanders are created (one per experiment), so avoid a
+    # per-instance __dict__
+    __slots__ = ('_variables', '_experiment_set',
+                 '_application_name', '_workload_name', '_experiment_name',
+                 '_application_namespace', '_workload_namespace',
+                 '_experiment_namespace', '_env_namespace',
+                 '_application_input_dir', '_workload_input_dir',
+                 '_application_run_dir', '_workload_run_dir',
+                 '_experiment_run_dir')
+
     def __init__(self, variables, experiment_set):
         self._variables = variables
 
@@ -170,8 +343,7 @@ class Expander(object):
         pulling a list from a different experiment.
         """
         try:
-            math_ast = ast.parse(str(var), mode='eval')
-            value = self.eval_math(math_ast.body)
+            value = self.eval_math(_math_ast(str(var)))
             if isinstance(value, list):
                 return value
             return var
@@ -223,8 +395,7 @@ class Expander(object):
 
         if self._fully_expanded(expanded):
             try:
-                math_ast = ast.parse(str(expanded), mode='eval')
-                evaluated = self.eval_math(math_ast.body)
+                evaluated = self.eval_math(_math_ast(str(expanded)))
                 expanded = evaluated
             except MathEvaluationError as e:
                 tty.debug(e)
@@ -253,8 +424,8 @@ class Expander(object):
         Yields:
           Each keyword argument in in_str
         """
-        if isinstance(in_str, six.string_types):
-            for keyword in string.Formatter().parse(in_str):
+        if isinstance(in_str, str):
+            for keyword in _iter_template(in_str):
                 if keyword[1]:
                     yield keyword[1]
 
@@ -284,24 +455,24 @@ class Expander(object):
           in_str (str): Expanded version of input string
         """
 
+        # Strings without any braces (e.g. names and paths) expand to themselves
+        if isinstance(in_str, str) and '{' not in in_str and '}' not in in_str:
+            return in_str
+
         exp_dict = ExpansionDict()
-        exp_positional = []
-        if isinstance(in_str, six.string_types):
-            for tup in formatter.parse(in_str):
+        if isinstance(in_str, str):
+            for tup in _iter_template(in_str):
                 kw = tup[1]
                 if kw is not None:
                     if len(kw) > 0 and kw in expansion_vars:
                         exp_dict[kw] = self._partial_expand(expansion_vars,
                                                             expansion_vars[kw])
-                    elif len(kw) == 0:
-                        exp_positional.append('{}')
 
             passthrough_vars = {}
             for kw, val in exp_dict.items():
                 if self._fully_expanded(val):
                     try:
-                        math_ast = ast.parse(str(val), mode='eval')
-                        evaluated = self.eval_math(math_ast.body)
+                        evaluated = self.eval_math(_math_ast(str(val)))
                         exp_dict[kw] = evaluated
                     except MathEvaluationError as e:
                         tty.debug(e)
@@ -314,8 +485,16 @@ class Expander(object):
                         passthrough_vars[kw] = '{' + kw + '}'
             exp_dict.update(passthrough_vars)
 
+            template = _compile_template(in_str)
+            if template is not None:
+                return _render_template(template, exp_dict)
+
             try:
-                return formatter.vformat(in_str, exp_positional, exp_dict)
+                if _missing_positional_args(in_str):
+                    raise IndexError(f'Replacement index out of range in {in_str}')
+
+                # Empty positional fields are passed through, by escaping them
+                return empty_field_regex.sub(_escape_empty_field, in_str).format_map(exp_dict)
             except IndexError as e:
                 if allow_passthrough:
                     return in_str
@@ -354,28 +533,12 @@ class Expander(object):
         Some operators will generate floating point, while
         others will generate integers (if the inputs are integers).
         """
-        if isinstance(node, ast.Num):
-            return self._ast_num(node)
-        elif isinstance(node, ast.Constant):
-            return self._ast_constant(node)
-        elif isinstance(node, ast.Name):
-            return self._ast_name(node)
-        elif isinstance(node, ast.Attribute):
-            return self._ast_attr(node)
-        elif isinstance(node, ast.Compare):
-            return self._eval_comparisons(node)
-        elif isinstance(node, ast.BoolOp):
-            return self._eval_bool_op(node)
-        elif isinstance(node, ast.BinOp):
-            return self._eval_binary_ops(node)
-        elif isinstance(node, ast.UnaryOp):
-            return self._eval_unary_ops(node)
-        elif isinstance(node, ast.Call):
-            return self._eval_function_call(node)
-        else:
+        eval_func = self._math_dispatch.get(type(node))
+        if eval_func is None:
             node_type = str(type(node))
             raise MathEvaluationError(f'Unsupported math AST node {node_type}:\n' +
                                       f'\t{node.__dict__}')
+        return eval_func(self, node)
 
     # Ast logic helper methods
     def __raise_syntax_error(self, node):
@@ -383,10 +546,6 @@ class Expander(object):
         raise RambleSyntaxError(f'Syntax error while processing {node_type} node:\n' +
                                 f'{node.__dict__}')
 
-    def _ast_num(self, node):
-        """Handle a number node in the ast"""
-        return node.n
-
     def _ast_constant(self, node):
         """Handle a constant node in the ast"""
         return node.value
@@ -497,7 +656,7 @@ class Expander(object):
             left_eval = self.eval_math(node.left)
             right_eval = self.eval_math(node.right)
             op = supported_math_operators[type(node.op)]
-            if isinstance(left_eval, six.string_types) or isinstance(right_eval, six.string_types):
+            if isinstance(left_eval, str) or isinstance(right_eval, str):
                 raise SyntaxError('Unsupported operand type in binary operator')
             return op(left_eval, right_eval)
         except TypeError:
@@ -512,7 +671,7 @@ class Expander(object):
         """
         try:
             operand = self.eval_math(node.operand)
-            if isinstance(operand, six.string_types):
+            if isinstance(operand, str):
                 raise SyntaxError('Unsupported operand type in unary operator')
             op = supported_math_operators[type(node.op)]
             return op(operand)
@@ -521,6 +680,18 @@ class Expander(object):
         except KeyError:
             raise SyntaxError('Unsupported unary operator')
 
+    # Map AST node types to the method used to evaluate them in eval_math
+    _math_dispatch = {
+        ast.Constant: _ast_constant,
+        ast.Name: _ast_name,
+        ast.Attribute: _ast_attr,
+        ast.Compare: _eval_comparisons,
+        ast.BoolOp: _eval_bool_op,
+        ast.BinOp: _eval_binary_ops,
+        ast.UnaryOp: _eval_unary_ops,
+        ast.Call: _eval_function_call,
+    }
+
 
 class ExpanderError(ramble.error.RambleError):
     """Raised when an error happens within an expander"""
@@ -8,6 +8,7 @@
 
 from enum import Enum
 import os
+import sys
 import math
 import fnmatch
 
@@ -48,6 +49,8 @@ class ExperimentSet(object):
         self.experiment_order = []
         self.chained_experiments = {}
         self.chained_order = []
+        self._chains_defined = False
+        self._primary_search_cache = {}
         self._workspace = workspace
 
         self._env_variables = {}
@@ -279,14 +282,10 @@ class ExperimentSet(object):
         - processes_per_node
         - n_threads
         """
-        n_ranks = variables[self.keywords.n_ranks] if self.keywords.n_ranks in \
-            variables.keys() else None
-        ppn = variables[self.keywords.processes_per_node] if self.keywords.processes_per_node \
-            in variables.keys() else None
-        n_nodes = variables[self.keywords.n_nodes] if self.keywords.n_nodes in \
-            variables.keys() else None
-        n_threads = variables[self.keywords.n_threads] if self.keywords.n_threads in \
-            variables.keys() else None
+        n_ranks = variables.get(self.keywords.n_ranks)
+        ppn = variables.get(self.keywords.processes_per_node)
+        n_nodes = variables.get(self.keywords.n_nodes)
+        n_threads = variables.get(self.keywords.n_threads)
 
         if n_ranks:
             n_ranks = int(expander.expand_var(n_ranks))
@@ -373,14 +372,19 @@ class ExperimentSet(object):
                             merged_internals[internal_section] = \
                                 self._internals[context][internal_section]
             if self._chained_experiments[context]:
-                for chained_exp in self._chained_experiments[context]:
-                    merged_chained_experiments.append(chained_exp.copy())
+                merged_chained_experiments.extend(chained_exp.copy() for chained_exp
+                                                  in self._chained_experiments[context])
+            # Modifiers are kept in definition order, and are not merged by
+            # name, so a modifier can be applied more than once (e.g. in
+            # different modes)
             if self._modifiers[context]:
-                for modifier in self._modifiers[context]:
-                    merged_mods.append(modifier.copy())
+                merged_mods.extend(modifier.copy() for modifier in self._modifiers[context])
             if self._templates[context] is not None:
                 is_template = self._templates[context]
 
+        if merged_chained_experiments:
+            self._chains_defined = True
+
         for context in self._contexts:
             var_name = f'{context.name}_name'
             if self._context_names[context] not in context_variables:
@@ -450,22 +454,25 @@ class ExperimentSet(object):
 
             expander = ramble.expander.Expander(experiment_vars, self)
             self._compute_mpi_vars(expander, experiment_vars)
-            final_app_name = expander.expand_var_name(self.keywords.application_name,
-                                                      allow_passthrough=False)
-            final_wl_name = expander.expand_var_name(self.keywords.workload_name,
-                                                     allow_passthrough=False)
             final_exp_name = expander.expand_var(experiment_template_name, allow_passthrough=False)
 
-            # Skip explicitly excluded experiments
+            # Skip explicitly excluded experiments, before expanding anything else
             if final_exp_name in excluded_experiments:
                 continue
 
+            final_app_name = expander.expand_var_name(self.keywords.application_name,
+                                                      allow_passthrough=False)
+            final_wl_name = expander.expand_var_name(self.keywords.workload_name,
+                                                     allow_passthrough=False)
+
             experiment_vars[self.keywords.experiment_template_name] = experiment_template_name
             experiment_vars[self.keywords.application_name] = final_app_name
             experiment_vars[self.keywords.workload_name] = final_wl_name
             experiment_vars[self.keywords.experiment_name] = final_exp_name
 
-            experiment_namespace = expander.experiment_namespace
+            # Experiment names are used as keys throughout the set and its
+            # chains, so intern them to share one object per name
+            experiment_namespace = sys.intern(expander.experiment_namespace)
 
             experiment_vars[self.keywords.log_file] = os.path.join('{experiment_run_dir}',
                                                                    '{experiment_name}.out')
@@ -493,7 +500,14 @@ class ExperimentSet(object):
             self.experiments[experiment_namespace] = app_inst
             self.experiment_order.append(experiment_namespace)
 
+        # New primary experiments can match previously searched patterns
+        self._primary_search_cache.clear()
+
     def build_experiment_chains(self):
+        # Nothing to build if no ingested experiment defined a chain
+        if not self._chains_defined:
+            return
+
         base_experiments = self.experiment_order.copy()
 
         for experiment in base_experiments:
@@ -509,7 +523,7 @@ class ExperimentSet(object):
             yield exp, inst
 
     def add_chained_experiment(self, name, instance):
-        if name in self.chained_experiments.keys():
+        if name in self.chained_experiments:
             raise RambleExperimentSetError('Cannot add already defined chained ' +
                                            f'experiment {name} to this experiment set.')
         self.chained_experiments[name] = instance
@@ -519,15 +533,19 @@ class ExperimentSet(object):
         """Search primary experiments using a glob syntax.
 
         NOTE: This does not search experiments defined in an experiment chain
+
+        Every experiment in a chain searches for its chained experiments, so
+        results are cached until new primary experiments are added.
         """
-        return fnmatch.filter(self.experiment_order, pattern)
+        if pattern not in self._primary_search_cache:
+            self._primary_search_cache[pattern] = \
+                tuple(fnmatch.filter(self.experiment_order, pattern))
+        return self._primary_search_cache[pattern]
 
     def get_experiment(self, experiment):
-        if experiment in self.experiments.keys():
+        if experiment in self.experiments:
             return self.experiments[experiment]
-        if experiment in self.chained_experiments.keys():
-            return self.chained_experiments[experiment]
-        return None
+        return self.chained_experiments.get(experiment)
 
     def get_var_from_experiment(self, experiment, variable):
         """Lookup a variable in a given experiment
@@ -540,11 +558,10 @@ class ExperimentSet(object):
             variable: Name of variable to look up
         """
 
-        if experiment not in self.experiments.keys():
+        exp_app = self.experiments.get(experiment)
+        if exp_app is None:
             return None
 
-        exp_app = self.experiments[experiment]
-
         return exp_app.expander.expand_var(variable)
 
 
@@ -171,15 +171,18 @@ def workload_variable(name, default, description, values=None, workload=None,
                                                                             'workloads',
                                                                             'workload_variable')
 
+        # The definition is identical for every workload, so share one dict
+        var_def = {
+            'default': default,
+            'description': description
+        }
+        if values:
+            var_def['values'] = values
+
         for wl_name in all_workloads:
             if wl_name not in app.workload_variables:
                 app.workload_variables[wl_name] = {}
 
-            app.workload_variables[wl_name][name] = {
-                'default': default,
-                'description': description
-            }
-            if values:
-                app.workload_variables[wl_name][name]['values'] = values
+            app.workload_variables[wl_name][name] = var_def
 
     return _execute_workload_variable
@@ -8,12 +8,12 @@
 """Define base classes for modifier definitions"""
 
 import re
-import six
 import textwrap
 import fnmatch
 from typing import List
 
 from llnl.util.tty.colify import colified
+from llnl.util.lang import memoized
 import llnl.util.tty as tty
 
 from ramble.language.modifier_language import ModifierMeta
@@ -21,6 +21,81 @@ from ramble.language.shared_language import register_builtin  # noqa: F401
 from ramble.error import RambleError
 import ramble.util.colors as rucolor
 
+# Section titles used when printing modifier information
+_modifier_title = rucolor.section_title('Modifier: ')
+_description_title = rucolor.section_title('Description:\n')
+_tags_title = rucolor.section_title('Tags:\n')
+_mode_title = rucolor.section_title('Mode:')
+_variable_modifications_title = rucolor.nested_1('\tVariable Modifications:\n')
+_builtins_title = rucolor.section_title('Builtin Executables:\n')
+_executable_modifiers_title = rucolor.section_title('Executable Modifiers:\n')
+_package_manager_configs_title = rucolor.section_title('Package Manager Configs:\n')
+_default_compilers_title = rucolor.section_title('Default Compilers:\n')
+_software_specs_title = rucolor.section_title('Software Specs:\n')
+_spack_spec_title = rucolor.nested_3('\t\tSpack Spec:')
+_compiler_spec_title = rucolor.nested_3('\t\tCompiler Spec:')
+_compiler_title = rucolor.nested_3('\t\tCompiler:')
+_default_compiler_spec_title = rucolor.nested_3('\t\tCompiler Spec:\n')
+_default_compiler_title = rucolor.nested_3('\t\tCompiler:\n')
+
+# Executables a modifier applies to when none are given
+_default_on_executables = ('*',)
+
+# Variable modification methods
+_method_append = 'append'
+_method_prepend = 'prepend'
+
+# Shared doc string wrappers, keyed by indentation
+_doc_wrappers = {}
+
+
+@memoized
+def _wrap_doc(doc, indent):
+    """Wrap a doc string at 72 characters, and indent each line
+
+    Doc strings are constant for each modifier class, so results are cached.
+
+    Args:
+        doc (str): Doc string to wrap
+        indent (int): Number of spaces to indent each line with
+
+    Returns:
+        (str): Wrapped doc string
+    """
+    doc = ' '.join(doc.split())
+    if not doc:
+        return ""
+
+    wrapper = _doc_wrappers.get(indent)
+    if wrapper is None:
+        prefix = ' ' * indent
+        # Long tokens (URLs, specs) are kept whole, and hyphens are not
+        # treated as break points, which avoids textwrap's slow path on
+        # long runs of non-whitespace characters.
+        wrapper = textwrap.TextWrapper(width=72 + indent,
+                                       initial_indent=prefix,
+                                       subsequent_indent=prefix,
+                                       break_long_words=False,
+                                       break_on_hyphens=False)
+        _doc_wrappers[indent] = wrapper
+
+    return wrapper.fill(doc) + '\n'
+
+
+@memoized
+def _escape_spec(spec):
+    """Escape '@' in a spec string, so it is not treated as a color code
+
+    Spec strings are constant for each modifier class, so results are cached.
+
+    Args:
+        spec (str): Spec string to escape
+
+    Returns:
+        (str): Escaped spec string
+    """
+    return spec.replace('@', '@@')
+
 
 class ModifierBase(object, metaclass=ModifierMeta):
     name = None
@@ -38,21 +113,55 @@ class ModifierBase(object, metaclass=ModifierMeta):
     maintainers: List[str] = []
     tags: List[str] = []
 
+    # A modifier instance is copied for every experiment that uses it. These
+    # slots only avoid a per-instance __dict__ when every subclass also
+    # declares __slots__; the modifier definitions in the builtin repo do
+    # not, so their instances still get a __dict__.
+    __slots__ = ('_file_path', '_on_executables', '_usage_mode',
+                 '_mode_variable_modifications',
+                 '_mode_env_var_modifications', '_verbosity',
+                 '_compiled_builtin_re', '_compiled_on_exec', '_match_all',
+                 '_exec_mod_funcs')
+
     def __init__(self, file_path):
         super().__init__()
 
         self._file_path = file_path
-        self._on_executables = ['*']
+        self._on_executables = list(_default_on_executables)
         self._usage_mode = None
+        self._mode_variable_modifications = {}
+        self._mode_env_var_modifications = {}
 
         self._verbosity = 'short'
 
+        self._compiled_builtin_re = None
+        self._compiled_on_exec = None
+        self._match_all = False
+
+        self._exec_mod_funcs = None
+
     def copy(self):
-        """Deep copy a modifier instance"""
-        new_copy = type(self)(self._file_path)
+        """Deep copy a modifier instance
+
+        The copy is created without running __init__, and shares the
+        compiled executable patterns with this instance. Subclasses without
+        __slots__ keep their own state in the instance __dict__, which is
+        copied as well.
+        """
+        new_copy = object.__new__(type(self))
+        if hasattr(self, '__dict__'):
+            new_copy.__dict__.update(self.__dict__)
+        new_copy._file_path = self._file_path
         new_copy._on_executables = self._on_executables.copy()
         new_copy._usage_mode = self._usage_mode
+        new_copy._mode_variable_modifications = self._mode_variable_modifications
+        new_copy._mode_env_var_modifications = self._mode_env_var_modifications
         new_copy._verbosity = self._verbosity
+        new_copy._compiled_builtin_re = self._compiled_builtin_re
+        new_copy._compiled_on_exec = self._compiled_on_exec
+        new_copy._match_all = self._match_all
+        # Bound methods refer to this instance, so resolve them again
+        new_copy._exec_mod_funcs = None
 
         return new_copy
 
@@ -73,6 +182,11 @@ class ModifierBase(object, metaclass=ModifierMeta):
             self._usage_mode = list(self.modes.keys())[0]
             tty.msg(f'    Using default usage mode {self._usage_mode} on modifier {self.name}')
 
+        self._mode_variable_modifications = \
+            self.variable_modifications.get(self._usage_mode, {})
+        self._mode_env_var_modifications = \
+            self.env_var_modifications.get(self._usage_mode, {})
+
     def set_on_executables(self, on_executables):
         """Set the executables this modifier applies to.
 
@@ -87,88 +201,108 @@ class ModifierBase(object, metaclass=ModifierMeta):
             for exec_name in on_executables:
                 self._on_executables.append(exec_name)
         else:
-            self._on_executables = ['*']
-
-    def _long_print(self):
-        out_str = []
-        out_str.append(rucolor.section_title('Modifier: ') + f'{self.name}\n')
-        out_str.append('\n')
-
-        out_str.append(rucolor.section_title('Description:\n'))
-        if self.__doc__:
-            out_str.append(f'\t{self.__doc__}\n')
-        else:
-            out_str.append('\tNone\n')
-
-        if hasattr(self, 'tags'):
-            out_str.append('\n')
-            out_str.append(rucolor.section_title('Tags:\n'))
-            out_str.append(colified(self.tags, tty=True))
-            out_str.append('\n')
-
-        if hasattr(self, 'modes'):
-            out_str.append('\n')
-            for mode_name, wl_conf in self.modes.items():
-                out_str.append(rucolor.section_title('Mode:') + f' {mode_name}\n')
-
-                if mode_name in self.variable_modifications:
-                    out_str.append(rucolor.nested_1('\tVariable Modifications:\n'))
-                    for var, conf in self.variable_modifications[mode_name].items():
-                        indent = '\t\t'
-
-                        out_str.append(rucolor.nested_2(f'{indent}{var}:\n'))
-                        out_str.append(f'{indent}\tMethod: {conf["method"]}\n')
-                        out_str.append(f'{indent}\tModification: {conf["modification"]}\n')
+            self._on_executables = list(_default_on_executables)
 
-            out_str.append('\n')
+        self._compiled_on_exec = None
 
-        if hasattr(self, 'builtins'):
-            out_str.append(rucolor.section_title('Builtin Executables:\n'))
-            out_str.append('\t' + colified(self.builtins.keys(), tty=True) + '\n')
+    def _ensure_compiled(self):
+        """Compile the regular expressions used by applies_to_executable
 
-        if hasattr(self, 'executable_modifiers'):
-            out_str.append(rucolor.section_title('Executable Modifiers:\n'))
-            out_str.append('\t' + colified(self.executable_modifiers.keys(), tty=True) + '\n')
-
-        if hasattr(self, 'package_manager_configs'):
-            out_str.append(rucolor.section_title('Package Manager Configs:\n'))
-            for name, config in self.package_manager_configs.items():
-                out_str.append(f'\t{name} = {config}\n')
-            out_str.append('\n')
-
-        if hasattr(self, 'default_compilers'):
-            out_str.append(rucolor.section_title('Default Compilers:\n'))
-            for comp_name, comp_def in self.default_compilers.items():
-                out_str.append(rucolor.nested_2(f'\t{comp_name}:\n'))
-                out_str.append(rucolor.nested_3('\t\tSpack Spec:') +
-                               f'{comp_def["spack_spec"].replace("@", "@@")}\n')
+        Patterns are compiled once, and reused until the executables this
+        modifier applies to are changed.
+        """
+        if self._compiled_builtin_re is None:
+            self._compiled_builtin_re = re.compile(self._mod_prefix_builtin +
+                                                   re.escape(self.name) + '::')
 
-                if 'compiler_spec' in comp_def and comp_def['compiler_spec']:
-                    out_str.append(rucolor.nested_3('\t\tCompiler Spec:\n') +
-                                   f'{comp_def["compiler_spec"].replace("@", "@@")}\n')
+        if self._compiled_on_exec is None:
+            # A '*' pattern matches every executable, including builtins
+            self._match_all = '*' in self._on_executables
 
-                if 'compiler' in comp_def and comp_def['compiler']:
-                    out_str.append(rucolor.nested_3('\t\tCompiler:\n') +
-                                   f'{comp_def["compiler"]}\n')
-            out_str.append('\n')
+            # Fuse all patterns into one alternation, so matching an
+            # executable is a single regex match
+            self._compiled_on_exec = re.compile('|'.join(
+                f'(?:{fnmatch.translate(pattern)})' for pattern in self._on_executables
+            ))
 
-        if hasattr(self, 'software_specs'):
-            out_str.append(rucolor.section_title('Software Specs:\n'))
-            for spec_name, spec_def in self.software_specs.items():
-                out_str.append(rucolor.nested_2(f'\t{spec_name}:\n'))
-                out_str.append(rucolor.nested_3('\t\tSpack Spec:') +
-                               f'{spec_def["spack_spec"].replace("@", "@@")}\n')
+    def _long_print(self):
+        # Static titles are precomputed, only per-entry titles are colored here
+        nested_2 = rucolor.nested_2
 
-                if 'compiler_spec' in spec_def and spec_def['compiler_spec']:
-                    out_str.append(rucolor.nested_3('\t\tCompiler Spec:') +
-                                   f'{spec_def["compiler_spec"].replace("@", "@@")}\n')
+        yield f'{_modifier_title}{self.name}\n\n'
 
-                if 'compiler' in spec_def and spec_def['compiler']:
-                    out_str.append(rucolor.nested_3('\t\tCompiler:') +
-                                   f'{spec_def["compiler"]}\n')
-            out_str.append('\n')
+        if self.__doc__:
+            yield f'{_description_title}\t{self.__doc__}\n'
+        else:
+            yield f'{_description_title}\tNone\n'
+
+        tags = getattr(self, 'tags', None)
+        if tags is not None:
+            yield f'\n{_tags_title}{colified(tags, tty=True)}\n'
+
+        modes = getattr(self, 'modes', None)
+        if modes is not None:
+            yield '\n'
+            variable_modifications = getattr(self, 'variable_modifications', {})
+            for mode_name in modes:
+                yield f'{_mode_title} {mode_name}\n'
+
+                mode_mods = variable_modifications.get(mode_name)
+                if mode_mods is not None:
+                    yield _variable_modifications_title
+                    for var, conf in mode_mods.items():
+                        indent = '\t\t'
 
-        return out_str
+                        yield (nested_2(f'{indent}{var}:\n') +
+                               f'{indent}\tMethod: {conf["method"]}\n'
+                               f'{indent}\tModification: {conf["modification"]}\n')
+
+            yield '\n'
+
+        builtins = getattr(self, 'builtins', None)
+        if builtins is not None:
+            yield f'{_builtins_title}\t{colified(builtins.keys(), tty=True)}\n'
+
+        executable_modifiers = getattr(self, 'executable_modifiers', None)
+        if executable_modifiers is not None:
+            yield (f'{_executable_modifiers_title}'
+                   f'\t{colified(executable_modifiers.keys(), tty=True)}\n')
+
+        package_manager_configs = getattr(self, 'package_manager_configs', None)
+        if package_manager_configs is not None:
+            yield _package_manager_configs_title
+            for name, config in package_manager_configs.items():
+                yield f'\t{name} = {config}\n'
+            yield '\n'
+
+        default_compilers = getattr(self, 'default_compilers', None)
+        if default_compilers is not None:
+            yield _default_compilers_title
+            for comp_name, comp_def in default_compilers.items():
+                yield (nested_2(f'\t{comp_name}:\n') +
+                       f'{_spack_spec_title}{_escape_spec(comp_def["spack_spec"])}\n')
+
+                if comp_def.get('compiler_spec'):
+                    yield (f'{_default_compiler_spec_title}'
+                           f'{_escape_spec(comp_def["compiler_spec"])}\n')
+
+                if comp_def.get('compiler'):
+                    yield f'{_default_compiler_title}{comp_def["compiler"]}\n'
+            yield '\n'
+
+        software_specs = getattr(self, 'software_specs', None)
+        if software_specs is not None:
+            yield _software_specs_title
+            for spec_name, spec_def in software_specs.items():
+                yield (nested_2(f'\t{spec_name}:\n') +
+                       f'{_spack_spec_title}{_escape_spec(spec_def["spack_spec"])}\n')
+
+                if spec_def.get('compiler_spec'):
+                    yield f'{_compiler_spec_title}{_escape_spec(spec_def["compiler_spec"])}\n'
+
+                if spec_def.get('compiler'):
+                    yield f'{_compiler_title}{spec_def["compiler"]}\n'
+            yield '\n'
 
     def _short_print(self):
         return [self.name]
@@ -187,53 +321,43 @@ class ModifierBase(object, metaclass=ModifierMeta):
         if not self.__doc__:
             return ""
 
-        doc = re.sub(r'\s+', ' ', self.__doc__)
-        lines = textwrap.wrap(doc, 72)
-        results = six.StringIO()
-        for line in lines:
-            results.write((" " * indent) + line + "\n")
-        return results.getvalue()
+        return _wrap_doc(self.__doc__, indent)
 
     def modded_variables(self, app):
-        mods = {}
+        mode_mods = self._mode_variable_modifications
+        if not mode_mods:
+            return {}
 
-        if self._usage_mode not in self.variable_modifications:
-            return mods
-
-        for var, var_mod in self.variable_modifications[self._usage_mode].items():
-            if var_mod['method'] in ['append', 'prepend']:
-                # var_str = app.expander.expansion_str(var)
-                # prev_val = app.expander.expand_var(var_str)
-                prev_val = app.variables[var]
-                if var_mod['method'] == 'append':
-                    mods[var] = f'{prev_val} {var_mod["modification"]}'
-                else:  # method == prepend
-                    mods[var] = f'{var_mod["modification"]} {prev_val}'
+        app_vars = app.variables
+        mods = {}
+        for var, var_mod in mode_mods.items():
+            method = var_mod['method']
+            if method == _method_append:
+                mods[var] = f'{app_vars[var]} {var_mod["modification"]}'
+            elif method == _method_prepend:
+                mods[var] = f'{var_mod["modification"]} {app_vars[var]}'
             else:  # method == set
                 mods[var] = var_mod['modification']
 
         return mods
 
     def applies_to_executable(self, executable):
-        apply = False
+        self._ensure_compiled()
 
-        mod_regex = re.compile(self._mod_prefix_builtin + f'{self.name}::')
-        for pattern in self._on_executables:
-            if fnmatch.fnmatch(executable, pattern):
-                apply = True
+        if self._match_all:
+            return True
 
-        exec_match = mod_regex.match(executable)
-        if exec_match:
-            apply = True
-
-        return apply
+        return self._compiled_on_exec.match(executable) is not None or \
+            self._compiled_builtin_re.match(executable) is not None
 
     def apply_executable_modifiers(self, executable_name, executable, app_inst=None):
+        if self._exec_mod_funcs is None:
+            self._exec_mod_funcs = [getattr(self, exec_mod)
+                                    for exec_mod in self.executable_modifiers]
+
         pre_execs = []
         post_execs = []
-        for exec_mod in self.executable_modifiers:
-            mod_func = getattr(self, exec_mod)
-
+        for mod_func in self._exec_mod_funcs:
             pre_exec, post_exec = mod_func(executable_name, executable, app_inst=app_inst)
 
             pre_execs.extend(pre_exec)
@@ -242,11 +366,7 @@ class ModifierBase(object, metaclass=ModifierMeta):
         return pre_execs, post_execs
 
     def all_env_var_modifications(self):
-        if self._usage_mode not in self.env_var_modifications:
-            return
-
-        for action, conf in self.env_var_modifications[self._usage_mode].items():
-            yield action, conf
+        yield from self._mode_env_var_modifications.items()
 
 
 class ModifierError(RambleError):
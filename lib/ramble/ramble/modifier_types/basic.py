@@ -19,5 +19,7 @@ class BasicModifier(ModifierBase):
 
     modifier_class = 'BasicModifier'
 
+    __slots__ = ()
+
     def __init__(self, file_path):
         super().__init__(file_path)
@@ -20,5 +20,7 @@ class SpackModifier(ModifierBase):
     modifier_class = 'SpackModifier'
     uses_spack = True
 
+    __slots__ = ()
+
     def __init__(self, file_path):
         super().__init__(file_path)
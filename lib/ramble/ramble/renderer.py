@@ -160,46 +160,40 @@ class Renderer(object):
                 defined_zips[zip_group] = {'vars': {}, 'length': 0}
                 cur_zip = defined_zips[zip_group]
 
-                # Validate variable definitions
+                # Validate variable definitions, and record their lengths
+                var_lengths = {}
                 for var_name in group_def:
-                    if var_name not in object_variables:
-                        tty.die(f'An undefined variable {var_name} is defined in zip {zip_group}')
-
+                    # Zipped variables are removed from the definitions, so
+                    # check for reuse before checking the variable is defined
                     if var_name in zipped_vars:
                         tty.die(f'Variable {var_name} is used across multiple zips.\n'
                                 'Ensure it is only used in a single zip')
 
+                    if var_name not in object_variables:
+                        tty.die(f'An undefined variable {var_name} is defined in zip {zip_group}')
+
                     if not isinstance(object_variables[var_name], list):
                         tty.die(f'Variable {var_name} in zip {zip_group} '
                                 'does not refer to a vector.')
 
-                    if len(object_variables[var_name]) == 0:
+                    cur_len = len(object_variables[var_name])
+                    if cur_len == 0:
                         tty.die(f'Variable {var_name} in zip {zip_group} '
                                 'has an invalid length of 0')
 
-                # Validate variable lengths:
-                length_mismatch = False
-                for var_name in group_def:
-                    # Validate the length of the variables is the same
-                    cur_len = len(object_variables[var_name])
-                    if cur_zip['length'] == 0:
-                        cur_zip['length'] = cur_len
-                    elif cur_len != cur_zip['length']:
-                        length_mismatch = True
-                        tty.die(f'Variable {var_name} in zip {zip_group}\n'
-                                f'has a length of {cur_len} which differs from\n'
-                                f'the current max of {cur_zip["length"]}')
-
-                # Print length information in error case
-                if length_mismatch:
-                    err_context = object_variables[render_group.context]
+                    var_lengths[var_name] = cur_len
+
+                # Validate the length of the variables is the same
+                if len(set(var_lengths.values())) > 1:
+                    err_context = object_variables.get(render_group.context, '')
                     err_str = f'Length mismatch in zip {zip_group} in {render_group.object} '\
                               f'{err_context}\n'
-                    for var_name in group_def:
-                        err_str += f'\tVariable {var_name} has length ' \
-                                   f'of {len(object_variables[var_name])}\n'
+                    for var_name, var_len in var_lengths.items():
+                        err_str += f'\tVariable {var_name} has length of {var_len}\n'
                     tty.die(err_str)
 
+                cur_zip['length'] = next(iter(var_lengths.values()), 0)
+
                 # Extract variables for zip
                 for var_name in group_def:
                     # Add variable to the zip, and remove from the definitions
@@ -335,19 +329,23 @@ class Renderer(object):
 
             # Iterate over the vector length, and set the value in the
             # object dict to the index value.
-            for i in range(0, max_vector_size):
-                obj_vars = {}
-                for var, val in vector_vars.items():
-                    obj_vars[var] = val[i]
-
-                if matrix_objects:
-                    for matrix_object in matrix_objects:
-                        for var, val in matrix_object.items():
-                            obj_vars[var] = val
+            # Objects are generated one at a time, rather than building the
+            # full cross product of vectors and matrices up front. Each one is
+            # only read before the next is generated, so it is not copied.
+            def vector_objects():
+                for i in range(0, max_vector_size):
+                    obj_vars = {}
+                    for var, val in vector_vars.items():
+                        obj_vars[var] = val[i]
+
+                    if matrix_objects:
+                        for matrix_object in matrix_objects:
+                            obj_vars.update(matrix_object)
+                            yield obj_vars
+                    else:
+                        yield obj_vars
 
-                        new_objects.append(obj_vars.copy())
-                else:
-                    new_objects.append(obj_vars.copy())
+            new_objects = vector_objects()
 
         elif matrix_objects:
             new_objects = matrix_objects
@@ -359,18 +357,16 @@ class Renderer(object):
 
         for obj in new_objects:
             tty.debug(f'Rendering {render_group.object}:')
-            for var, val in obj.items():
-                object_variables[var] = val
-
-            keep_object = True
-            if exclude_where:
-                for where in exclude_where:
-                    evaluated = where_expander.expand_var(where)
-                    if evaluated == 'True':
-                        keep_object = False
-
-            if keep_object:
-                yield object_variables.copy()
+            object_variables.update(obj)
+
+            # Stop evaluating where clauses once one excludes the object
+            if exclude_where and any(where_expander.expand_var(where) == 'True'
+                                     for where in exclude_where):
+                continue
+
+            # This is the only copy made per object. It has to be a full dict,
+            # as consumers modify (and delete from) their variables in place.
+            yield object_variables.copy()
 
 
 class RambleRendererError(ramble.error.RambleError):
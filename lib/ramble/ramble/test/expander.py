@@ -47,6 +47,18 @@ def exp_dict():
         ('gromacs +blas', 'gromacs +blas'),
         ('range(0, 5)', '[0, 1, 2, 3, 4]'),
         ('{}', '{}'),
+        ('{n_nodes}/{}', '2/{}'),
+        ('{undefined_var}/{n_nodes}', '{undefined_var}/2'),
+        ('{{n_nodes}}', '{n_nodes}'),
+        ('{application_run_dir}/{experiment_name}', '/workspace/experiments/foo/baz'),
+        ('{n_nodes} == 2', 'True'),
+        ('"{application_name}"', 'foo'),
+        ('/{n_nodes:>3}/{}', '/  2/{}'),
+        ('/{:>4}/{n_nodes}', '/  {}/2'),
+        ('/{!r}/{n_nodes}', "/'{}'/2"),
+        ('{application_name}\n', 'foo'),
+        ('{application_name} ', 'foo'),
+        ('{application_name} . {workload_name}', 'foo.bar'),
     ]
 )
 def test_expansions(input, output):
@@ -94,6 +106,40 @@ def test_failed_expansions(input, expected_error, error_string):
         assert error_string in e
 
 
+@pytest.mark.parametrize(
+    'input,expected_error,error_string',
+    [
+        ('{0}', ramble.expander.RambleSyntaxError,
+         'Error occurred while parsing an expansion string'),
+        ('{n_nodes}/{1}', ramble.expander.RambleSyntaxError,
+         'Error occurred while parsing an expansion string'),
+        ('{undefined_var}', ramble.expander.ExpanderError,
+         'is not allowed to passthrough undefined variables'),
+    ]
+)
+def test_failed_expansions_without_passthrough(input, expected_error, error_string):
+    expansion_vars = exp_dict()
+
+    expander = ramble.expander.Expander(expansion_vars, None)
+
+    with pytest.raises(expected_error, match=error_string):
+        expander.expand_var(input, allow_passthrough=False)
+
+
+def test_expand_var_name_sees_variable_changes():
+    expansion_vars = exp_dict()
+
+    expander = ramble.expander.Expander(expansion_vars, None)
+
+    assert expander.expand_var_name('var1') == '3'
+
+    # Variables are modified in place by applications, so later expansions
+    # must use the new definitions (including indirect references)
+    expansion_vars['var3'] = '4'
+    assert expander.expand_var_name('var1') == '4'
+    assert expander.expand_var_name('var1', extra_vars={'var3': '5'}) == '5'
+
+
 def test_expansion_namespaces():
     expansion_vars = exp_dict()
 
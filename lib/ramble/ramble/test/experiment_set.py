@@ -6,9 +6,15 @@
 # option. This file may not be copied, modified, or distributed
 # except according to those terms.
 
+import itertools
+from collections import ChainMap
 import os
+import re
 import pytest
 
+import ramble.config
+import ramble.paths
+import ramble.repository
 import ramble.workspace
 import ramble.experiment_set
 import ramble.renderer
@@ -17,1747 +23,1032 @@ from ramble.main import RambleCommand
 
 pytestmark = pytest.mark.usefixtures('mutable_config',
                                      'mutable_mock_workspace_path',
-                                     'mutable_mock_apps_repo',
+                                     'shared_mock_apps_repo',
                                      )
 
 workspace  = RambleCommand('workspace')
 
-
-def test_single_experiment_in_set(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': '2',
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, None,
-                                       None, None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-
-
-def test_vector_experiment_in_set(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, None,
-                                       None, None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8' in exp_set.experiments.keys()
-
-
-def test_vector_length_mismatch_errors(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': ['2'],
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        with pytest.raises(SystemExit):
-            exp_set.set_experiment_context(exp_name, exp_vars, None, None, None,
-                                           None, None, None, None)
-
-            captured = capsys.readouterr()
-
-            assert 'Length mismatch in vector variables in experiment series1_{n_ranks}' \
-                in captured
-            assert 'Variable wl_var2 has length 1' in captured
-            assert 'Variable n_nodes has length 2' in captured
-
-
-def test_nonunique_vector_errors(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{processes_per_node}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        with pytest.raises(SystemExit):
-            exp_set.set_experiment_context(exp_name, exp_vars, None, None, None,
-                                           None, None, None, None)
-            captured = capsys.readouterr()
-            assert "is not unique." in captured
-
-
-def test_zipped_vector_experiments(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': ['2', '4']
-        }
-        exp_name = 'series1_{n_ranks}_{processes_per_node}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
+# Variable definitions shared by most tests. Tests copy these before
+# adding their own definitions.
+BASE_APP_VARS = {
+    'app_var1': '1',
+    'app_var2': '2',
+    'n_ranks': '{processes_per_node}*{n_nodes}',
+    'mpi_command': '',
+    'batch_submit': ''
+}
+
+BASE_WL_VARS = {
+    'wl_var1': '1',
+    'wl_var2': '2',
+    'processes_per_node': '2'
+}
+
+
+def configure_exp_set(exp_set, app_vars, wl_vars, exp_name=None, exp_vars=None,
+                      zips=None, matrices=None, exclude=None):
+    """Set the basic application and test_wl workload contexts of an experiment set
+
+    If an experiment name is given, the experiment context is set as well.
+    """
+    exp_set.set_application_context('basic', app_vars, None, None, None, None)
+    exp_set.set_workload_context('test_wl', wl_vars, None, None, None, None)
+    if exp_name is not None:
+        exp_set.set_experiment_context(exp_name, exp_vars, None, zips, matrices, None,
+                                       None, None, None, exclude)
+
+
+def remove_var_everywhere(exp_set, var):
+    """Remove a variable definition from every context of an experiment set"""
+    for context_vars in exp_set._variables.values():
+        if context_vars:
+            context_vars.pop(var, None)
+
+
+# Module-scoped fixtures only hold state, created under tmpdir_factory which
+# is unique to each test process. Tests activate that state themselves, so
+# this module can also be distributed with pytest-xdist (``-n``) if it is
+# installed.
+@pytest.fixture(scope='module')
+def shared_workspace_root(tmpdir_factory, mock_configuration_scopes):
+    """Create a single workspace, shared by every test in this module"""
+    ws_root = str(tmpdir_factory.mktemp('experiment-set').join('test'))
+    with ramble.config.use_configuration(*mock_configuration_scopes):
+        workspace('create', '-d', ws_root)
+
+    assert ramble.workspace.is_workspace_dir(ws_root)
+    return ws_root
+
+
+@pytest.fixture(scope='module')
+def shared_workspace(shared_workspace_root, mock_configuration_scopes):
+    """Read the shared workspace once, so tests do not re-parse its config"""
+    with ramble.config.use_configuration(*mock_configuration_scopes):
+        return ramble.workspace.Workspace(shared_workspace_root)
+
+
+@pytest.fixture(scope='module')
+def mock_apps_repo_state(mock_configuration_scopes):
+    """Mock applications repository, shared by every test in this module
+
+    The basic application is loaded once here, so its definition is
+    already imported when the tests run.
+    """
+    obj_type = ramble.repository.ObjectTypes.applications
+    repo = ramble.repository.Repo(ramble.paths.mock_builtin_path, object_type=obj_type)
+    with ramble.config.use_configuration(*mock_configuration_scopes):
+        repo.get('basic')
+    return repo
+
+
+@pytest.fixture(scope='function')
+def shared_mock_apps_repo(mock_apps_repo_state):
+    """Use the shared mock applications repository in a test"""
+    obj_type = ramble.repository.ObjectTypes.applications
+    with ramble.repository.use_repositories(mock_apps_repo_state,
+                                            object_type=obj_type) as repo_path:
+        yield repo_path
+
+
+@pytest.fixture(scope='function')
+def exp_set(mutable_mock_workspace_path, shared_workspace):
+    """Build an empty experiment set from the shared workspace"""
+    with shared_workspace as ws:
+        yield ramble.experiment_set.ExperimentSet(ws)
+
+
+@pytest.mark.parametrize(
+    'app_vars,wl_vars,exp_name,exp_vars,exp_matrices,expected',
+    [
+        pytest.param(
+            BASE_APP_VARS,
+            BASE_WL_VARS,
+            'series1_{n_ranks}',
+            {'exp_var1': '1', 'exp_var2': '2', 'n_nodes': '2'},
+            None,
+            frozenset({'basic.test_wl.series1_4'}),
+            id='single'
+        ),
+        pytest.param(
+            BASE_APP_VARS,
+            BASE_WL_VARS,
+            'series1_{n_ranks}',
+            {'exp_var1': '1', 'exp_var2': '2', 'n_nodes': ['2', '4']},
+            None,
+            frozenset({'basic.test_wl.series1_4', 'basic.test_wl.series1_8'}),
+            id='vector'
+        ),
+        pytest.param(
+            BASE_APP_VARS,
+            {**BASE_WL_VARS, 'processes_per_node': ['2', '4']},
+            'series1_{n_ranks}_{processes_per_node}',
+            {'exp_var1': '1', 'exp_var2': '2', 'n_nodes': ['2', '4']},
+            None,
+            frozenset({'basic.test_wl.series1_4_2', 'basic.test_wl.series1_16_4'}),
+            id='zipped_vector'
+        ),
+        pytest.param(
+            BASE_APP_VARS,
+            BASE_WL_VARS,
+            'series1_{n_ranks}',
+            {'exp_var1': '1', 'exp_var2': '2', 'n_nodes': ['2', '3']},
+            [['n_nodes']],
+            frozenset({'basic.test_wl.series1_4', 'basic.test_wl.series1_6'}),
+            id='matrix'
+        ),
+        pytest.param(
+            BASE_APP_VARS,
+            {**BASE_WL_VARS, 'processes_per_node': ['1', '4', '6']},
+            'series1_{n_ranks}',
+            {'exp_var1': '1', 'exp_var2': '2', 'n_nodes': ['2', '4']},
+            [['n_nodes', 'processes_per_node']],
+            frozenset(f'basic.test_wl.series1_{int(n_nodes) * int(ppn)}'
+                      for n_nodes, ppn in itertools.product(['2', '4'], ['1', '4', '6'])),
+            id='matrix_multiplication'
+        ),
+        pytest.param(
+            BASE_APP_VARS,
+            {**BASE_WL_VARS, 'processes_per_node': ['2', '4']},
+            'series1_{n_ranks}',
+            {'exp_var1': '1', 'exp_var2': '2', 'n_nodes': ['2', '3']},
+            [['n_nodes']],
+            frozenset({'basic.test_wl.series1_4', 'basic.test_wl.series1_8',
+                       'basic.test_wl.series1_6', 'basic.test_wl.series1_12'}),
+            id='matrix_vector'
+        ),
+        pytest.param(
+            BASE_APP_VARS,
+            {**BASE_WL_VARS, 'processes_per_node': ['2', '4']},
+            'series1_{n_ranks}_{processes_per_node}',
+            {'exp_var1': '1', 'exp_var2': '2', 'n_nodes': ['2', '3']},
+            [['n_nodes'], ['processes_per_node']],
+            frozenset({'basic.test_wl.series1_4_2', 'basic.test_wl.series1_12_4'}),
+            id='multi_matrix'
+        ),
+        pytest.param(
+            {'app_var1': '1', 'app_var2': '2', 'mpi_command': '', 'batch_submit': ''},
+            BASE_WL_VARS,
+            'series1_{n_ranks}',
+            {'exp_var1': '1', 'exp_var2': '2', 'n_nodes': ['2', '3']},
+            [['n_nodes']],
+            frozenset({'basic.test_wl.series1_4', 'basic.test_wl.series1_6'}),
+            id='n_ranks_default'
+        ),
+        pytest.param(
+            {**BASE_APP_VARS, 'n_ranks': ['4', '6']},
+            BASE_WL_VARS,
+            'series1_{n_ranks}_{n_nodes}',
+            {'exp_var1': '1', 'exp_var2': '2'},
+            [['n_ranks']],
+            frozenset({'basic.test_wl.series1_4_2', 'basic.test_wl.series1_6_3'}),
+            id='n_nodes_default'
+        ),
+    ]
+)
+def test_experiments_in_set(exp_set, app_vars, wl_vars, exp_name, exp_vars,
+                            exp_matrices, expected):
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars,
+                      matrices=exp_matrices)
+
+    assert expected.issubset(exp_set.experiments)
+
+
+def test_vector_length_mismatch_errors(capsys):
+    # Vector lengths are checked while rendering, so render the
+    # experiment variables directly rather than building a full context.
+    render_group = ramble.renderer.RenderGroup('experiment', 'create')
+    render_group.variables = {
+        'experiment_name': 'series1_{n_ranks}',
+        'wl_var2': ['2'],
+        'n_nodes': ['2', '4'],
+    }
+
+    with pytest.raises(SystemExit):
+        list(ramble.renderer.Renderer().render_objects(render_group))
+
+    captured = capsys.readouterr()
+    assert 'Length mismatch in vector variables in experiment series1_{n_ranks}' \
+        in captured.err
+    assert 'Variable wl_var2 has length 1' in captured.err
+    assert 'Variable n_nodes has length 2' in captured.err
+
+
+def test_nonunique_vector_errors(exp_set, capsys):
+    app_vars = {**BASE_APP_VARS}
+
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{processes_per_node}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '4']
+    }
+
+    configure_exp_set(exp_set, app_vars, wl_vars)
+    with pytest.raises(SystemExit):
         exp_set.set_experiment_context(exp_name, exp_vars, None, None, None,
                                        None, None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4_2' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_16_4' in exp_set.experiments.keys()
-
-
-def test_matrix_experiments(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '3']
-        }
-
-        exp_matrices = [
-            ['n_nodes']
-        ]
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, exp_matrices, None,
-                                       None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_6' in exp_set.experiments.keys()
-
-
-def test_matrix_multiplication_experiments(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': ['1', '4', '6']
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
+    captured = capsys.readouterr()
+    assert "is not unique." in captured.err
 
-        exp_matrices = [
-            ['n_nodes', 'processes_per_node']
-        ]
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, exp_matrices, None,
-                                       None, None, None)
-        exp_set.build_experiment_chains()
+def test_matrix_undefined_var_errors(capsys):
+    render_group = ramble.renderer.RenderGroup('experiment', 'create')
+    render_group.variables = {
+        'experiment_name': 'series1_{n_ranks}_{processes_per_node}',
+        'processes_per_node': ['2', '4'],
+        'n_nodes': ['2', '3'],
+    }
+    render_group.matrices = [
+        ['n_nodes'],
+        ['foo']
+    ]
 
-        assert 'basic.test_wl.series1_2' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_12' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_16' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_24' in exp_set.experiments.keys()
+    with pytest.raises(SystemExit):
+        list(ramble.renderer.Renderer().render_objects(render_group))
 
+    captured = capsys.readouterr()
+    assert "variable or zip foo has not been defined yet." in captured.err
 
-def test_matrix_vector_experiments(mutable_mock_workspace_path):
-    workspace('create', 'test')
 
-    assert 'test' in workspace('list')
+def test_experiment_names_match(exp_set):
+    app_vars = {**BASE_APP_VARS}
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
+    wl_vars = {**BASE_WL_VARS, 'processes_per_node': ['2', '4']}
+    exp_name = 'series1_{n_ranks}_{processes_per_node}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '3']
+    }
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
+    exp_matrices = [
+        ['n_nodes'],
+        ['processes_per_node']
+    ]
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': ['2', '4']
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '3']
-        }
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars, matrices=exp_matrices)
 
-        exp_matrices = [
-            ['n_nodes']
-        ]
+    assert {
+        'basic.test_wl.series1_4_2',
+        'basic.test_wl.series1_12_4',
+    }.issubset(exp_set.experiments)
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, exp_matrices, None,
-                                       None, None, None)
-        exp_set.build_experiment_chains()
+    names = {exp: app.expander.expand_var('{experiment_namespace}')
+             for exp, app in exp_set.all_experiments()}
+    assert all(exp == name for exp, name in names.items())
 
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_6' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_12' in exp_set.experiments.keys()
 
+def test_cross_experiment_variable_references(exp_set):
+    app_vars = {**BASE_APP_VARS}
 
-def test_multi_matrix_experiments(mutable_mock_workspace_path):
-    workspace('create', 'test')
+    wl_vars = {**BASE_WL_VARS}
+    exp1_name = 'series1_{n_ranks}'
+    exp1_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': '2',
+        'test_var': 'success'
+    }
 
-    assert 'test' in workspace('list')
+    exp2_name = 'series2_{n_ranks}'
+    exp2_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': '2',
+        'test_var': 'test_var in basic.test_wl.series1_4'
+    }
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
+    configure_exp_set(exp_set, app_vars, wl_vars, exp1_name, exp1_vars)
+    exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None,
+                                   None, None, None, None)
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
+    assert {'basic.test_wl.series1_4', 'basic.test_wl.series2_4'}.issubset(exp_set.experiments)
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': ['2', '4']
-        }
-        exp_name = 'series1_{n_ranks}_{processes_per_node}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '3']
-        }
+    exp2_app = exp_set.experiments['basic.test_wl.series2_4']
+    assert exp2_app.expander.expand_var('{test_var}') == 'success'
 
-        exp_matrices = [
-            ['n_nodes'],
-            ['processes_per_node']
-        ]
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, exp_matrices, None,
-                                       None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4_2' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_12_4' in exp_set.experiments.keys()
-
-
-def test_matrix_undefined_var_errors(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': ['2', '4']
-        }
-        exp_name = 'series1_{n_ranks}_{processes_per_node}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '3']
-        }
-
-        exp_matrices = [
-            ['n_nodes'],
-            ['foo']
-        ]
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-
-        with pytest.raises(SystemExit):
-            exp_set.set_experiment_context(exp_name, exp_vars, None, None, exp_matrices,
-                                           None, None, None)
-            captured = capsys.readouterr()
-            assert "variable foo has not been defined yet." in captured
-
-
-def test_experiment_names_match(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': ['2', '4']
-        }
-        exp_name = 'series1_{n_ranks}_{processes_per_node}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '3']
-        }
-
-        exp_matrices = [
-            ['n_nodes'],
-            ['processes_per_node']
-        ]
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, exp_matrices, None,
-                                       None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4_2' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_12_4' in exp_set.experiments.keys()
-
-        for exp, app in exp_set.all_experiments():
-            assert exp == app.expander.expand_var('{experiment_namespace}')
-
-
-def test_cross_experiment_variable_references(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp1_name = 'series1_{n_ranks}'
-        exp1_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': '2',
-            'test_var': 'success'
-        }
-
-        exp2_name = 'series2_{n_ranks}'
-        exp2_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': '2',
-            'test_var': 'test_var in basic.test_wl.series1_4'
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp1_name, exp1_vars, None, None, None,
-                                       None, None, None, None)
-        exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None,
-                                       None, None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series2_4' in exp_set.experiments.keys()
-
-        exp2_app = exp_set.experiments['basic.test_wl.series2_4']
-        assert exp2_app.expander.expand_var('{test_var}') == 'success'
-
-
-def test_cross_experiment_missing_experiment_errors(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp1_name = 'series1_{n_ranks}'
-        exp1_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': '2',
-            'test_var': 'processes_per_node in basic.test_wl.does_not_exist'
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp1_name, exp1_vars, None, None, None,
-                                       None, None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-
-        exp1_app = exp_set.experiments['basic.test_wl.series1_4']
-
-        with pytest.raises(ramble.expander.RambleSyntaxError) as e:
-            exp1_app.expander.expand_var('{test_var}')
-            expected = f'basic.test_wl_does_not_exist does not exist in "{exp1_vars["test_var"]}"'
-            assert e.error == expected
-
-
-def test_n_ranks_correct_defaults(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '3']
-        }
-
-        exp_matrices = [
-            ['n_nodes']
-        ]
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, exp_matrices, None,
-                                       None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_6' in exp_set.experiments.keys()
-
-
-def test_n_nodes_correct_defaults(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': ['4', '6'],
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}_{n_nodes}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-        }
-
-        exp_matrices = [
-            ['n_ranks']
-        ]
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, exp_matrices, None,
-                                       None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4_2' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_6_3' in exp_set.experiments.keys()
-
-
-def test_processes_per_node_correct_defaults(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-        # Remove workspace vars, which default to a `processes_per_node = -1` definition.
-        exp_set._variables[exp_set._contexts.workspace] = {}
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': ['4', '6'],
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-        }
-        exp_name = 'series1_{n_ranks}_{processes_per_node}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '3']
-        }
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, None,
-                                       None, None, None, None)
-        exp_set.build_experiment_chains()
+def test_cross_experiment_missing_experiment_errors(exp_set):
+    app_vars = {**BASE_APP_VARS}
 
-        assert 'basic.test_wl.series1_4_2' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_6_2' in exp_set.experiments.keys()
+    wl_vars = {**BASE_WL_VARS}
+    exp1_name = 'series1_{n_ranks}'
+    exp1_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': '2',
+        'test_var': 'processes_per_node in basic.test_wl.does_not_exist'
+    }
 
+    configure_exp_set(exp_set, app_vars, wl_vars, exp1_name, exp1_vars)
 
-@pytest.mark.parametrize('var', [
-    'command', 'spack_env'
-])
-def test_reserved_keywords_error_in_application(mutable_mock_workspace_path, var, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': ['4', '6'],
-            var: 'should_fail',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
+    assert 'basic.test_wl.series1_4' in exp_set.experiments
 
-        with pytest.raises(ramble.experiment_set.RambleVariableDefinitionError):
-            exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-            captured = capsys.readouterr()
-            assert "In application basic" in captured
-            assert f"{var}" in captured
-            assert "is reserved by ramble" in captured
+    exp1_app = exp_set.experiments['basic.test_wl.series1_4']
 
+    expected = f'basic.test_wl.does_not_exist does not exist in: "{exp1_vars["test_var"]}"'
+    with pytest.raises(ramble.expander.RambleSyntaxError, match=re.escape(expected)):
+        exp1_app.expander.expand_var('{test_var}')
 
-@pytest.mark.parametrize('var', [
-    'command', 'spack_env'
-])
-def test_reserved_keywords_error_in_workload(mutable_mock_workspace_path, var, capsys):
-    workspace('create', 'test')
 
-    assert 'test' in workspace('list')
+def test_processes_per_node_correct_defaults(exp_set):
+    # Remove workspace vars, which default to a `processes_per_node = -1` definition.
+    exp_set._variables[exp_set._contexts.workspace] = {}
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
+    app_vars = {**BASE_APP_VARS, 'n_ranks': ['4', '6']}
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': ['4', '6'],
-            'mpi_command': '',
-            'batch_submit': ''
-        }
+    wl_vars = {
+        'wl_var1': '1',
+        'wl_var2': '2',
+    }
+    exp_name = 'series1_{n_ranks}_{processes_per_node}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '3']
+    }
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            var: 'should_fail'
-        }
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars)
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        with pytest.raises(ramble.experiment_set.RambleVariableDefinitionError):
-            exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-            captured = capsys.readouterr()
-            assert "In workload basic.test_wl" in captured
-            assert f"{var}" in captured
-            assert "is reserved by ramble" in captured
+    assert {'basic.test_wl.series1_4_2', 'basic.test_wl.series1_6_2'}.issubset(exp_set.experiments)
 
 
-@pytest.mark.parametrize('var', [
-    'command', 'spack_env'
+@pytest.mark.parametrize('context,var', [
+    ('application', 'command'),
+    ('application', 'spack_env'),
+    ('workload', 'command'),
+    ('workload', 'spack_env'),
+    ('experiment', 'command'),
+    ('experiment', 'spack_env'),
 ])
-def test_reserved_keywords_error_in_experiment(mutable_mock_workspace_path, var, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-        # Remove workspace vars, which default to a `processes_per_node = -1` definition.
-        exp_set._variables[exp_set._contexts.base] = {}
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': ['4', '6'],
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
+def test_reserved_keywords_error(exp_set, context, var):
+    context_vars = {
+        'application': ChainMap({'n_ranks': ['4', '6']}, BASE_APP_VARS),
+        'workload': {
             'wl_var1': '1',
             'wl_var2': '2',
-        }
-        exp_name = 'series1_{n_ranks}_{processes_per_node}'
-        exp_vars = {
+        },
+        'experiment': {
             'exp_var1': '1',
             'exp_var2': '2',
             'n_nodes': ['2', '3'],
-            var: 'should_fail'
-        }
+        },
+    }
+    context_vars[context][var] = 'should_fail'
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        with pytest.raises(ramble.experiment_set.RambleVariableDefinitionError):
-            exp_set.set_experiment_context(exp_name, exp_vars, None, None, None,
-                                           None, None, None, None)
-            captured = capsys.readouterr()
-            assert "In experiment basic.test_wl.series1_{n_ranks}_{processes_per_node}" in captured
-            assert f"{var}" in captured
-            assert "is reserved by ramble" in captured
+    with pytest.raises(ramble.experiment_set.RambleVariableDefinitionError,
+                       match=f'In {context} .*"{var}".* is reserved by ramble'):
+        configure_exp_set(exp_set, context_vars['application'], context_vars['workload'],
+                          'series1_{n_ranks}_{processes_per_node}',
+                          context_vars['experiment'])
 
 
 @pytest.mark.parametrize('var', [
     'batch_submit', 'mpi_command'
 ])
-def test_missing_required_keyword_errors(mutable_mock_workspace_path, var, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-        for context in exp_set._contexts:
-            if exp_set._variables[context] and var in exp_set._variables[context]:
-                del exp_set._variables[context][var]
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': ['4', '6'],
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-        }
-        exp_name = 'series1_{n_ranks}_{processes_per_node}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '3'],
-            'batch_submit': '',
-            'mpi_command': ''
-        }
-
-        if var in exp_vars.keys():
-            del exp_vars[var]
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        with pytest.raises(ramble.experiment_set.RambleVariableDefinitionError):
-            exp_set.set_experiment_context(exp_name, exp_vars, None, None, None,
-                                           None, None, None, None)
-            captured = capsys.readouterr()
-            assert f'Required key "{var}" is not defined' in captured.err
-            assert 'One or more required keys are not defined within an experiment.' \
-                in captured.err
-            assert "In experiment basic.test_wl.series1_{n_ranks}_{processes_per_node}" \
-                in captured.err
-
-
-def test_chained_experiments_populate_new_experiments(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'processes_per_node': '1',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-        }
-        exp1_name = 'test1'
-        exp1_vars = {
-            'n_ranks': '2'
-        }
-        exp2_name = 'series2_{n_ranks}'
-        exp2_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_ranks': ['4', '6']
-        }
-        exp2_chains = [
-            {
-                'name': 'basic.test_wl.test1',
-                'order': 'before_root',
-                'command': '{execute_experiment}',
-                'variables': {}
-            },
-            {
-                'name': 'basic.test_wl.test1',
-                'order': 'after_root',
-                'command': '{execute_experiment}',
-                'variables': {}
-            }
-        ]
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp1_name, exp1_vars, None, None, None,
+def test_missing_required_keyword_errors(exp_set, var, capsys):
+    remove_var_everywhere(exp_set, var)
+
+    app_vars = {
+        'app_var1': '1',
+        'app_var2': '2',
+        'n_ranks': ['4', '6'],
+    }
+
+    wl_vars = {
+        'wl_var1': '1',
+        'wl_var2': '2',
+    }
+    exp_name = 'series1_{n_ranks}_{processes_per_node}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '3'],
+        'batch_submit': '',
+        'mpi_command': ''
+    }
+
+    if var in exp_vars:
+        del exp_vars[var]
+
+    configure_exp_set(exp_set, app_vars, wl_vars)
+    with pytest.raises(ramble.experiment_set.RambleVariableDefinitionError,
+                       match='One or more required keys are not defined within an '
+                             'experiment.') as e:
+        exp_set.set_experiment_context(exp_name, exp_vars, None, None, None,
                                        None, None, None, None)
-        exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None, None, None,
-                                       exp2_chains, None)
+    assert str(e.value).startswith('In experiment basic.test_wl.series1_')
+    captured = capsys.readouterr()
+    assert f'Required key "{var}" is not defined' in captured.err
+
+
+def test_chained_experiments_populate_new_experiments(exp_set, capsys):
+    app_vars = {
+        'app_var1': '1',
+        'app_var2': '2',
+        'processes_per_node': '1',
+        'mpi_command': '',
+        'batch_submit': ''
+    }
+
+    wl_vars = {
+        'wl_var1': '1',
+        'wl_var2': '2',
+    }
+    exp1_name = 'test1'
+    exp1_vars = {
+        'n_ranks': '2'
+    }
+    exp2_name = 'series2_{n_ranks}'
+    exp2_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_ranks': ['4', '6']
+    }
+    exp2_chains = [
+        {
+            'name': 'basic.test_wl.test1',
+            'order': 'before_root',
+            'command': '{execute_experiment}',
+            'variables': {}
+        },
+        {
+            'name': 'basic.test_wl.test1',
+            'order': 'after_root',
+            'command': '{execute_experiment}',
+            'variables': {}
+        }
+    ]
+
+    configure_exp_set(exp_set, app_vars, wl_vars, exp1_name, exp1_vars)
+    exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None, None, None,
+                                   exp2_chains, None)
+    exp_set.build_experiment_chains()
+
+    assert {
+        'basic.test_wl.series2_4',
+        'basic.test_wl.series2_6',
+        'basic.test_wl.test1',
+    }.issubset(exp_set.experiments)
+    assert {
+        'basic.test_wl.series2_4.chain.0.basic.test_wl.test1',
+        'basic.test_wl.series2_4.chain.1.basic.test_wl.test1',
+        'basic.test_wl.series2_6.chain.0.basic.test_wl.test1',
+        'basic.test_wl.series2_6.chain.1.basic.test_wl.test1',
+    }.issubset(exp_set.chained_experiments)
+
+
+def test_chained_experiment_has_correct_directory(exp_set, capsys):
+    app_vars = {
+        'app_var1': '1',
+        'app_var2': '2',
+        'processes_per_node': '1',
+        'mpi_command': '',
+        'batch_submit': ''
+    }
+
+    wl_vars = {
+        'wl_var1': '1',
+        'wl_var2': '2',
+    }
+    exp1_name = 'test1'
+    exp1_vars = {
+        'n_ranks': '2'
+    }
+    exp2_name = 'series2_{n_ranks}'
+    exp2_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_ranks': '4'
+    }
+    exp2_chains = [
+        {
+            'name': 'basic.test_wl.test1',
+            'order': 'before_root',
+            'command': '{execute_experiment}',
+            'variables': {}
+        },
+    ]
+
+    configure_exp_set(exp_set, app_vars, wl_vars, exp1_name, exp1_vars)
+    exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None, None, None,
+                                   exp2_chains, None)
+    exp_set.build_experiment_chains()
+
+    parent_name = 'basic.test_wl.series2_4'
+    chained_name = 'basic.test_wl.series2_4.chain.0.basic.test_wl.test1'
+    chained_dir = '0.basic.test_wl.test1'
+    assert parent_name in exp_set.experiments
+    assert chained_name in exp_set.chained_experiments
+
+    parent_inst = exp_set.get_experiment(parent_name)
+    chained_inst = exp_set.get_experiment(chained_name)
+
+    parent_run_dir = parent_inst.expander.expand_var('{experiment_run_dir}')
+    expected_dir = os.path.join(parent_run_dir, 'chained_experiments', chained_dir)
+    assert chained_inst.variables['experiment_run_dir'] == expected_dir
+
+
+def test_chained_cycle_errors(exp_set):
+    app_vars = {
+        'app_var1': '1',
+        'app_var2': '2',
+        'processes_per_node': '1',
+        'mpi_command': '',
+        'batch_submit': ''
+    }
+
+    wl_vars = {
+        'wl_var1': '1',
+        'wl_var2': '2',
+    }
+    exp1_name = 'test1'
+    exp1_vars = {
+        'n_ranks': '2'
+    }
+    exp2_name = 'series2_{n_ranks}'
+    exp2_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_ranks': '4'
+    }
+    exp2_chains = [
+        {
+            'name': 'basic.test_wl.series2_4',
+            'order': 'before_root',
+            'command': '{execute_experiment}',
+            'variables': {}
+        },
+    ]
+
+    configure_exp_set(exp_set, app_vars, wl_vars, exp1_name, exp1_vars)
+    exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None, None, None,
+                                   exp2_chains, None)
+    with pytest.raises(ChainCycleDetectedError,
+                       match='Cycle: basic.test_wl.series2_4 -> basic.test_wl.series2_4'):
         exp_set.build_experiment_chains()
 
-        assert 'basic.test_wl.series2_4' in \
-            exp_set.experiments
-        assert 'basic.test_wl.series2_4.chain.0.basic.test_wl.test1' in \
-            exp_set.chained_experiments
-        assert 'basic.test_wl.series2_4.chain.1.basic.test_wl.test1' in \
-            exp_set.chained_experiments
-        assert 'basic.test_wl.series2_6' in \
-            exp_set.experiments
-        assert 'basic.test_wl.series2_6.chain.0.basic.test_wl.test1' in \
-            exp_set.chained_experiments
-        assert 'basic.test_wl.series2_6.chain.1.basic.test_wl.test1' in \
-            exp_set.chained_experiments
-        assert 'basic.test_wl.test1' in exp_set.experiments
-
-
-def test_chained_experiment_has_correct_directory(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'processes_per_node': '1',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-        }
-        exp1_name = 'test1'
-        exp1_vars = {
-            'n_ranks': '2'
-        }
-        exp2_name = 'series2_{n_ranks}'
-        exp2_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_ranks': '4'
-        }
-        exp2_chains = [
-            {
-                'name': 'basic.test_wl.test1',
-                'order': 'before_root',
-                'command': '{execute_experiment}',
-                'variables': {}
-            },
-        ]
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp1_name, exp1_vars, None, None, None,
-                                       None, None, None, None)
-        exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None, None, None,
-                                       exp2_chains, None)
+def test_chained_nested_cycle_errors(exp_set):
+    app_vars = {
+        'app_var1': '1',
+        'app_var2': '2',
+        'processes_per_node': '1',
+        'mpi_command': '',
+        'batch_submit': ''
+    }
+
+    wl_vars = {
+        'wl_var1': '1',
+        'wl_var2': '2',
+    }
+    exp1_name = 'test1'
+    exp1_vars = {
+        'n_ranks': '2'
+    }
+    exp1_chains = [
+        {
+            'name': 'basic.test_wl.series2_4',
+            'order': 'before_root',
+            'command': '{execute_experiment}',
+            'variables': {}
+        },
+    ]
+    exp2_name = 'series2_{n_ranks}'
+    exp2_vars = {
+        'n_ranks': '4'
+    }
+    exp2_chains = [
+        {
+            'name': 'basic.test_wl.series2_4',
+            'order': 'before_root',
+            'command': '{execute_experiment}',
+            'variables': {}
+        },
+    ]
+
+    configure_exp_set(exp_set, app_vars, wl_vars)
+    exp_set.set_experiment_context(exp1_name, exp1_vars, None, None, None, None, None,
+                                   exp1_chains, None)
+    exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None, None, None,
+                                   exp2_chains, None)
+    with pytest.raises(ChainCycleDetectedError,
+                       match='Cycle: basic.test_wl.test1 -> basic.test_wl.series2_4 -> '
+                             'basic.test_wl.series2_4'):
         exp_set.build_experiment_chains()
 
-        parent_name = 'basic.test_wl.series2_4'
-        chained_name = 'basic.test_wl.series2_4.chain.0.basic.test_wl.test1'
-        chained_dir = '0.basic.test_wl.test1'
-        assert parent_name in exp_set.experiments
-        assert chained_name in exp_set.chained_experiments
-
-        parent_inst = exp_set.get_experiment(parent_name)
-        chained_inst = exp_set.get_experiment(chained_name)
-
-        parent_run_dir = parent_inst.expander.expand_var('{experiment_run_dir}')
-        expected_dir = os.path.join(parent_run_dir, 'chained_experiments', chained_dir)
-        assert chained_inst.variables['experiment_run_dir'] == expected_dir
-
-
-def test_chained_cycle_errors(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'processes_per_node': '1',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-        }
-        exp1_name = 'test1'
-        exp1_vars = {
-            'n_ranks': '2'
-        }
-        exp2_name = 'series2_{n_ranks}'
-        exp2_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_ranks': '4'
-        }
-        exp2_chains = [
-            {
-                'name': 'basic.test_wl.series2_4',
-                'order': 'before_root',
-                'command': '{execute_experiment}',
-                'variables': {}
-            },
-        ]
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp1_name, exp1_vars, None, None, None,
-                                       None, None, None, None)
-        exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None, None, None,
-                                       exp2_chains, None)
-        with pytest.raises(ChainCycleDetectedError):
-            exp_set.build_experiment_chains()
-            captured = capsys.readouterr
-            assert "Cycle detected in experiment chain" in captured
-
-
-def test_chained_invalid_order_errors(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
+def test_chained_invalid_order_errors(exp_set, capsys):
+    app_vars = {
+        'app_var1': '1',
+        'app_var2': '2',
+        'processes_per_node': '1',
+        'mpi_command': '',
+        'batch_submit': ''
+    }
+
+    wl_vars = {
+        'wl_var1': '1',
+        'wl_var2': '2',
+    }
+    exp1_name = 'test1'
+    exp1_vars = {
+        'n_ranks': '2'
+    }
+    exp2_name = 'series2_{n_ranks}'
+    exp2_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_ranks': '4'
+    }
+    exp2_chains = [
+        {
+            'name': 'basic.test_wl.test1',
+            'order': 'foo',
+            'command': '{execute_experiment}',
+            'variables': {}
+        },
+    ]
+
+    configure_exp_set(exp_set, app_vars, wl_vars, exp1_name, exp1_vars)
+    exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None, None, None,
+                                   exp2_chains, None)
+    with pytest.raises(InvalidChainError, match='Invalid experiment chain defined:'):
+        exp_set.build_experiment_chains()
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'processes_per_node': '1',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-        }
-        exp1_name = 'test1'
-        exp1_vars = {
-            'n_ranks': '2'
-        }
-        exp2_name = 'series2_{n_ranks}'
-        exp2_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_ranks': '4'
+def test_modifiers_set_correctly(exp_set, capsys):
+    app_name = 'basic'
+    app_vars = {
+        'app_var1': '1',
+        'app_var2': '2',
+        'processes_per_node': '1',
+        'mpi_command': '',
+        'batch_submit': ''
+    }
+
+    app_mods = [
+        {
+            'name': 'test_app_mod',
+            'mode': 'test_app',
+            'on_executable': [
+                'builtin::env_vars'
+            ]
         }
-        exp2_chains = [
-            {
-                'name': 'basic.test_wl.test1',
-                'order': 'foo',
-                'command': '{execute_experiment}',
-                'variables': {}
-            },
-        ]
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp1_name, exp1_vars, None, None, None,
-                                       None, None, None, None)
-        exp_set.set_experiment_context(exp2_name, exp2_vars, None, None, None, None, None,
-                                       exp2_chains, None)
-        with pytest.raises(InvalidChainError):
-            exp_set.build_experiment_chains()
-            captured = capsys.readouterr
-            assert "Invalid experiment chain defined:" in captured
+    ]
 
+    wl_name = 'test_wl'
+    wl_vars = {
+        'wl_var1': '1',
+        'wl_var2': '2',
+    }
 
-def test_modifiers_set_correctly(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'processes_per_node': '1',
-            'mpi_command': '',
-            'batch_submit': ''
+    wl_mods = [
+        {
+            'name': 'test_wl_mod',
+            'mode': 'test_wl',
+            'on_executable': [
+                'builtin::env_vars'
+            ]
         }
+    ]
 
-        app_mods = [
-            {
-                'name': 'test_app_mod',
-                'mode': 'test_app',
-                'on_executable': [
-                    'builtin::env_vars'
-                ]
-            }
-        ]
+    exp1_name = 'test1'
+    exp1_vars = {
+        'n_ranks': '2'
+    }
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
+    exp1_mods = [
+        {
+            'name': 'test_exp1_mod',
+            'mode': 'test_exp1',
+            'on_executable': [
+                'builtin::env_vars'
+            ]
         }
+    ]
 
-        wl_mods = [
-            {
-                'name': 'test_wl_mod',
-                'mode': 'test_wl',
-                'on_executable': [
-                    'builtin::env_vars'
-                ]
-            }
-        ]
+    exp_set.set_application_context(app_name, app_vars, None, None, None, None, app_mods)
+    exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None, wl_mods)
+    exp_set.set_experiment_context(exp1_name, exp1_vars, None, None, None, None,
+                                   None, None, exp1_mods, None)
 
-        exp1_name = 'test1'
-        exp1_vars = {
-            'n_ranks': '2'
-        }
+    assert 'basic.test_wl.test1' in exp_set.experiments
+    app_inst = exp_set.experiments['basic.test_wl.test1']
+    assert app_inst.modifiers is not None
 
-        exp1_mods = [
-            {
-                'name': 'test_exp1_mod',
-                'mode': 'test_exp1',
-                'on_executable': [
-                    'builtin::env_vars'
-                ]
-            }
-        ]
+    expected_modifiers = set(['test_app_mod', 'test_wl_mod', 'test_exp1_mod'])
+    for mod_def in app_inst.modifiers:
+        assert mod_def['name'] in expected_modifiers
+        expected_modifiers.remove(mod_def['name'])
+    assert len(expected_modifiers) == 0
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None, app_mods)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None, wl_mods)
-        exp_set.set_experiment_context(exp1_name, exp1_vars, None, None, None, None,
-                                       None, None, exp1_mods, None)
 
-        assert 'basic.test_wl.test1' in exp_set.experiments
-        app_inst = exp_set.experiments['basic.test_wl.test1']
-        assert app_inst.modifiers is not None
+def test_explicit_zips_work(exp_set):
+    app_vars = {**BASE_APP_VARS}
 
-        expected_modifiers = set(['test_app_mod', 'test_wl_mod', 'test_exp1_mod'])
-        for mod_def in app_inst.modifiers:
-            assert mod_def['name'] in expected_modifiers
-            expected_modifiers.remove(mod_def['name'])
-        assert len(expected_modifiers) == 0
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '4']
+    }
 
+    exp_zips = {
+        'test_zip': ['n_nodes']
+    }
 
-def test_explicit_zips_work(mutable_mock_workspace_path):
-    workspace('create', 'test')
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars, zips=exp_zips)
 
-    assert 'test' in workspace('list')
+    assert {'basic.test_wl.series1_4', 'basic.test_wl.series1_8'}.issubset(exp_set.experiments)
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
+def test_explicit_zips_in_matrix(exp_set):
+    app_vars = {**BASE_APP_VARS}
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}_{exp_var1}'
+    exp_vars = {
+        'exp_var1': ['1', 'a', '3'],
+        'exp_var2': ['2', 'b', '4'],
+        'n_nodes': ['2', '4']
+    }
 
-        exp_zips = {
-            'test_zip': ['n_nodes']
-        }
+    exp_matrices = [['test_zip']]
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, None, None,
-                                       None, None, None, None)
-        exp_set.build_experiment_chains()
+    exp_zips = {
+        'test_zip': ['exp_var1', 'exp_var2']
+    }
 
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8' in exp_set.experiments.keys()
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars,
+                      zips=exp_zips, matrices=exp_matrices)
 
+    assert {
+        'basic.test_wl.series1_4_1',
+        'basic.test_wl.series1_4_a',
+        'basic.test_wl.series1_4_3',
+        'basic.test_wl.series1_8_1',
+        'basic.test_wl.series1_8_a',
+        'basic.test_wl.series1_8_3',
+    }.issubset(exp_set.experiments)
 
-def test_explicit_zips_in_matrix(mutable_mock_workspace_path):
-    workspace('create', 'test')
 
-    assert 'test' in workspace('list')
+def test_explicit_zips_unconsumed(exp_set):
+    app_vars = {**BASE_APP_VARS}
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}_{exp_var1}'
+    exp_vars = {
+        'exp_var1': ['1', 'a', '3'],
+        'exp_var2': ['2', 'b', '4'],
+        'n_nodes': ['2', '4']
+    }
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
+    exp_matrices = [['n_nodes']]
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}_{exp_var1}'
-        exp_vars = {
-            'exp_var1': ['1', 'a', '3'],
-            'exp_var2': ['2', 'b', '4'],
-            'n_nodes': ['2', '4']
-        }
+    exp_zips = {
+        'test_zip': ['exp_var1', 'exp_var2']
+    }
 
-        exp_matrices = [['test_zip']]
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars,
+                      zips=exp_zips, matrices=exp_matrices)
 
-        exp_zips = {
-            'test_zip': ['exp_var1', 'exp_var2']
-        }
+    assert {
+        'basic.test_wl.series1_4_1',
+        'basic.test_wl.series1_4_a',
+        'basic.test_wl.series1_4_3',
+        'basic.test_wl.series1_8_1',
+        'basic.test_wl.series1_8_a',
+        'basic.test_wl.series1_8_3',
+    }.issubset(exp_set.experiments)
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, exp_matrices, None,
-                                       None, None, None, None)
-        exp_set.build_experiment_chains()
 
-        assert 'basic.test_wl.series1_4_1' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_4_a' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_4_3' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8_1' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8_a' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8_3' in exp_set.experiments.keys()
+def test_single_var_explicit_zip(exp_set):
+    app_vars = {**BASE_APP_VARS}
 
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '4']
+    }
 
-def test_explicit_zips_unconsumed(mutable_mock_workspace_path):
-    workspace('create', 'test')
+    exp_zips = {
+        'test_zip': ['n_nodes'],
+    }
 
-    assert 'test' in workspace('list')
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars, zips=exp_zips)
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
+    assert {'basic.test_wl.series1_4', 'basic.test_wl.series1_8'}.issubset(exp_set.experiments)
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}_{exp_var1}'
-        exp_vars = {
-            'exp_var1': ['1', 'a', '3'],
-            'exp_var2': ['2', 'b', '4'],
-            'n_nodes': ['2', '4']
-        }
+def test_zip_undefined_var_errors(exp_set, capsys):
+    app_vars = {**BASE_APP_VARS}
 
-        exp_matrices = [['n_nodes']]
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '4']
+    }
 
-        exp_zips = {
-            'test_zip': ['exp_var1', 'exp_var2']
-        }
+    exp_zips = {
+        'test_zip': ['foo'],
+    }
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, exp_matrices, None,
+    configure_exp_set(exp_set, app_vars, wl_vars)
+    with pytest.raises(SystemExit):
+        exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, None, None,
                                        None, None, None, None)
-        exp_set.build_experiment_chains()
+    captured = capsys.readouterr()
+    assert 'An undefined variable foo is defined in zip test_zip' in captured.err
 
-        assert 'basic.test_wl.series1_4_1' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_4_a' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_4_3' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8_1' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8_a' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8_3' in exp_set.experiments.keys()
 
+def test_zip_multi_use_var_errors(exp_set, capsys):
+    app_vars = {**BASE_APP_VARS}
 
-def test_single_var_explicit_zip(mutable_mock_workspace_path):
-    workspace('create', 'test')
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '4']
+    }
 
-    assert 'test' in workspace('list')
+    exp_zips = {
+        'test_zip1': ['n_nodes'],
+        'test_zip2': ['n_nodes'],
+    }
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
-
-        exp_zips = {
-            'test_zip': ['n_nodes'],
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
+    configure_exp_set(exp_set, app_vars, wl_vars)
+    with pytest.raises(SystemExit):
         exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, None, None,
                                        None, None, None, None)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8' in exp_set.experiments.keys()
-
-
-def test_zip_undefined_var_errors(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
+    captured = capsys.readouterr()
+    assert 'Variable n_nodes is used across multiple zips' in captured.err
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
 
-        exp_zips = {
-            'test_zip': ['foo'],
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        with pytest.raises(SystemExit):
-            exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, None, None,
-                                           None, None, None, None)
-            captured = capsys.readouterr()
-            assert "An undefined variable foo is defined in zip test_zip" in captured
-
-
-def test_zip_multi_use_var_errors(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
+def test_zip_non_list_var_errors(exp_set, capsys):
+    app_vars = {**BASE_APP_VARS}
 
-    assert 'test' in workspace('list')
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '4']
+    }
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
+    exp_zips = {
+        'test_zip': ['exp_var1'],
+    }
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
+    configure_exp_set(exp_set, app_vars, wl_vars)
+    with pytest.raises(SystemExit):
+        exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, None, None,
+                                       None, None, None, None)
+    captured = capsys.readouterr()
+    assert 'Variable exp_var1 in zip test_zip does not refer to a vector' in captured.err
 
-        exp_zips = {
-            'test_zip1': ['n_nodes'],
-            'test_zip2': ['n_nodes'],
-        }
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        with pytest.raises(SystemExit):
-            exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, None, None,
-                                           None, None, None, None)
-            captured = capsys.readouterr()
-            assert 'Variable n_nodes is used across multiple zips' in captured
+def test_zip_variable_lengths_errors(exp_set, capsys):
+    app_vars = {**BASE_APP_VARS}
 
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': ['2'],
+        'n_nodes': ['2', '4']
+    }
 
-def test_zip_non_list_var_errors(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
+    exp_zips = {
+        'test_zip': ['n_nodes', 'exp_var2'],
+    }
 
-    assert 'test' in workspace('list')
+    configure_exp_set(exp_set, app_vars, wl_vars)
+    with pytest.raises(SystemExit):
+        exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, None, None,
+                                       None, None, None, None)
+    captured = capsys.readouterr()
+    assert 'Length mismatch in zip test_zip in experiment series1_{n_ranks}' in captured.err
+    assert 'Variable exp_var2 has length of 1' in captured.err
+    assert 'Variable n_nodes has length of 2' in captured.err
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
+def test_vector_experiment_with_explicit_excludes(exp_set):
+    app_vars = {**BASE_APP_VARS}
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '4']
+    }
 
-        exp_zips = {
-            'test_zip': ['exp_var1'],
+    exp_exclude = {
+        'variables': {
+            'n_nodes': ['4']
         }
+    }
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        with pytest.raises(SystemExit):
-            exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, None, None,
-                                           None, None, None, None)
-            captured = capsys.readouterr()
-            assert 'Variable exp_var1 in zip test_zip does not refer to a vector' in captured
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars, exclude=exp_exclude)
 
+    assert 'basic.test_wl.series1_4' in exp_set.experiments
+    assert 'basic.test_wl.series1_8' not in exp_set.experiments
 
-def test_zip_variable_lengths_errors(mutable_mock_workspace_path, capsys):
-    workspace('create', 'test')
 
-    assert 'test' in workspace('list')
+def test_matrix_experiments_explicit_excludes(exp_set):
+    app_vars = {**BASE_APP_VARS}
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['2', '3']
+    }
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': ['2'],
-            'n_nodes': ['2', '4']
-        }
-
-        exp_zips = {
-            'test_zip': ['n_nodes', 'exp_var2'],
-        }
+    exp_matrices = [
+        ['n_nodes']
+    ]
 
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        with pytest.raises(SystemExit):
-            exp_set.set_experiment_context(exp_name, exp_vars, None, exp_zips, None, None,
-                                           None, None, None, None)
-            captured = capsys.readouterr()
-            assert 'Length mismatch in zip test_zip in experiment series1_{n_ranks}' in captured
-            assert 'Variable exp_var has length 1' in captured
-            assert 'Variable n_nodes has length 2' in captured
+    exp_exclude = {
+        'variables': {
+            'n_nodes': ['3'],
+        },
+        'matrix': ['n_nodes']
+    }
 
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars,
+                      matrices=exp_matrices, exclude=exp_exclude)
 
-def test_vector_experiment_with_explicit_excludes(mutable_mock_workspace_path):
-    workspace('create', 'test')
+    assert 'basic.test_wl.series1_4' in exp_set.experiments
+    assert 'basic.test_wl.series1_6' not in exp_set.experiments
 
-    assert 'test' in workspace('list')
 
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
+def test_vector_experiment_with_where_excludes(exp_set):
+    app_vars = {**BASE_APP_VARS}
 
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['1', '2', '3', '4', '5']
+    }
 
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '4']
-        }
-
-        exp_exclude = {
-            'variables': {
-                'n_nodes': ['4']
-            }
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, None, None,
-                                       None, None, None, exp_exclude)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8' not in exp_set.experiments.keys()
-
-
-def test_matrix_experiments_explicit_excludes(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['2', '3']
-        }
-
-        exp_matrices = [
-            ['n_nodes']
+    exp_exclude = {
+        'where': [
+            '{n_nodes} > 2 and {n_nodes} < 5'
         ]
-
-        exp_exclude = {
-            'variables': {
-                'n_nodes': ['3'],
-            },
-            'matrix': ['n_nodes']
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, exp_matrices, None,
-                                       None, None, None, exp_exclude)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_6' not in exp_set.experiments.keys()
-
-
-def test_vector_experiment_with_where_excludes(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['1', '2', '3', '4', '5']
-        }
-
-        exp_exclude = {
-            'where': [
-                '{n_nodes} > 2 and {n_nodes} < 5'
-            ]
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, None, None,
-                                       None, None, None, exp_exclude)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_2' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_6' not in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8' not in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_10' in exp_set.experiments.keys()
-
-
-def test_vector_experiment_with_multi_where_excludes(mutable_mock_workspace_path):
-    workspace('create', 'test')
-
-    assert 'test' in workspace('list')
-
-    with ramble.workspace.read('test') as ws:
-        exp_set = ramble.experiment_set.ExperimentSet(ws)
-
-        app_name = 'basic'
-        app_vars = {
-            'app_var1': '1',
-            'app_var2': '2',
-            'n_ranks': '{processes_per_node}*{n_nodes}',
-            'mpi_command': '',
-            'batch_submit': ''
-        }
-
-        wl_name = 'test_wl'
-        wl_vars = {
-            'wl_var1': '1',
-            'wl_var2': '2',
-            'processes_per_node': '2'
-        }
-        exp_name = 'series1_{n_ranks}'
-        exp_vars = {
-            'exp_var1': '1',
-            'exp_var2': '2',
-            'n_nodes': ['1', '2', '3', '4', '5']
-        }
-
-        exp_exclude = {
-            'where': [
-                '{n_nodes} < 2',
-                '{n_nodes} > 4'
-            ]
-        }
-
-        exp_set.set_application_context(app_name, app_vars, None, None, None, None)
-        exp_set.set_workload_context(wl_name, wl_vars, None, None, None, None)
-        exp_set.set_experiment_context(exp_name, exp_vars, None, None, None, None,
-                                       None, None, None, exp_exclude)
-        exp_set.build_experiment_chains()
-
-        assert 'basic.test_wl.series1_2' not in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_4' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_6' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_8' in exp_set.experiments.keys()
-        assert 'basic.test_wl.series1_10' not in exp_set.experiments.keys()
+    }
+
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars, exclude=exp_exclude)
+
+    assert {
+        'basic.test_wl.series1_2',
+        'basic.test_wl.series1_4',
+        'basic.test_wl.series1_10',
+    }.issubset(exp_set.experiments)
+    assert {
+        'basic.test_wl.series1_6',
+        'basic.test_wl.series1_8',
+    }.isdisjoint(exp_set.experiments)
+
+
+def test_vector_experiment_with_multi_where_excludes(exp_set):
+    app_vars = {**BASE_APP_VARS}
+
+    wl_vars = {**BASE_WL_VARS}
+    exp_name = 'series1_{n_ranks}'
+    exp_vars = {
+        'exp_var1': '1',
+        'exp_var2': '2',
+        'n_nodes': ['1', '2', '3', '4', '5']
+    }
+
+    exp_exclude = {
+        'where': [
+            '{n_nodes} < 2',
+            '{n_nodes} > 4'
+        ]
+    }
+
+    configure_exp_set(exp_set, app_vars, wl_vars, exp_name, exp_vars, exclude=exp_exclude)
+
+    assert {
+        'basic.test_wl.series1_4',
+        'basic.test_wl.series1_6',
+        'basic.test_wl.series1_8',
+    }.issubset(exp_set.experiments)
+    assert {
+        'basic.test_wl.series1_2',
+        'basic.test_wl.series1_10',
+    }.isdisjoint(exp_set.experiments)
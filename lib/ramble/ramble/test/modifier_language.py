@@ -7,6 +7,8 @@
 # except according to those terms.
 """Perform tests of the Application class"""
 
+import types
+
 import pytest
 
 from ramble.modkit import *  # noqa
@@ -428,3 +430,84 @@ def test_env_var_modification_directive(mod_class):
             assert test_def['name'] in mod_inst.env_var_modifications[mode][method]
             assert test_def['modification'] == \
                 mod_inst.env_var_modifications[mode][method][test_def['name']]
+
+
+@pytest.mark.parametrize('mod_class', mod_types)
+def test_applies_to_executable(mod_class):
+    test_class = generate_mod_class(mod_class)
+    test_class.name = 'test-mod'
+    mod_inst = test_class('/not/a/path')
+
+    assert mod_inst.applies_to_executable('foo')
+
+    mod_inst.set_on_executables(['exec*', 'bar'])
+    assert mod_inst.applies_to_executable('exec1')
+    assert mod_inst.applies_to_executable('bar')
+    assert not mod_inst.applies_to_executable('foo')
+    assert not mod_inst.applies_to_executable('foobar')
+    assert mod_inst.applies_to_executable('modifier_builtin::test-mod::foo')
+    assert not mod_inst.applies_to_executable('modifier_builtin::other-mod::foo')
+
+    mod_copy = mod_inst.copy()
+    assert mod_copy.applies_to_executable('exec1')
+    assert not mod_copy.applies_to_executable('foo')
+
+    mod_inst.set_on_executables(None)
+    assert not mod_copy.applies_to_executable('foo')
+    assert mod_inst.applies_to_executable('foo')
+
+
+@pytest.mark.parametrize('mod_class', mod_types)
+def test_copy_keeps_subclass_state(mod_class):
+    test_class = generate_mod_class(mod_class)
+    mod_inst = test_class('/not/a/path')
+    mod_inst.subclass_state = ['foo']
+
+    mod_copy = mod_inst.copy()
+    assert mod_copy.subclass_state == ['foo']
+
+
+@pytest.mark.parametrize('mod_class', mod_types)
+def test_modded_variables(mod_class):
+    test_class = generate_mod_class(mod_class)
+    mod_inst = test_class('/not/a/path')
+
+    variable_modification('var_append', 'post', method='append',  # noqa: F405
+                          mode='modded_vars_mode')(mod_inst)
+    variable_modification('var_prepend', 'pre', method='prepend',  # noqa: F405
+                          mode='modded_vars_mode')(mod_inst)
+    variable_modification('var_set', 'new', method='set',  # noqa: F405
+                          mode='modded_vars_mode')(mod_inst)
+
+    app_inst = types.SimpleNamespace(variables={
+        'var_append': 'a',
+        'var_prepend': 'b',
+        'var_set': 'c',
+    })
+
+    assert mod_inst.modded_variables(app_inst) == {}
+
+    mod_inst.set_usage_mode('modded_vars_mode')
+    expected = {
+        'var_append': 'a post',
+        'var_prepend': 'pre b',
+        'var_set': 'new',
+    }
+    assert mod_inst.modded_variables(app_inst) == expected
+    assert mod_inst.copy().modded_variables(app_inst) == expected
+
+
+@pytest.mark.parametrize('mod_class', mod_types)
+def test_all_env_var_modifications(mod_class):
+    test_class = generate_mod_class(mod_class)
+    mod_inst = test_class('/not/a/path')
+
+    env_var_modification('env_mods_var', 'value', method='set',  # noqa: F405
+                         mode='env_mods_mode')(mod_inst)
+
+    assert list(mod_inst.all_env_var_modifications()) == []
+
+    mod_inst.set_usage_mode('env_mods_mode')
+    expected = [('set', {'env_mods_var': 'value'})]
+    assert list(mod_inst.all_env_var_modifications()) == expected
+    assert list(mod_inst.copy().all_env_var_modifications()) == expected